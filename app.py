@@ -13,9 +13,11 @@ from extensions import db
 from routes.upload import upload_bp
 from routes.job_upload import job_bp
 from routes.match import match_bp
+from routes.scoring import scoring_bp
 
 # import models so migrations can detect them
 from models.resume import Resume
+from models.skill_index import ResumeTerm
 
 load_dotenv()
 
@@ -44,6 +46,7 @@ def create_app():
     app.register_blueprint(upload_bp, url_prefix='/api/upload')
     app.register_blueprint(job_bp, url_prefix='/api/job')
     app.register_blueprint(match_bp, url_prefix='/api/match')
+    app.register_blueprint(scoring_bp, url_prefix='/api/scoring')
 
     # health route
     @app.route('/')
@@ -0,0 +1,77 @@
+"""
+Benchmark for nlp/dictionary_snapshot.py.
+
+Times import-time dictionary setup (load_dictionaries) without a
+snapshot, i.e. parsing the text files and compiling the matcher and
+fuzzy skill index, against loading a current snapshot. Runs on the
+dictionaries in data/ and on a synthetic taxonomy of SYNTHETIC_ENTRIES
+phrases, and checks that both paths give the same lists.
+
+    python -m benchmarks.bench_dictionaries
+"""
+import random
+import shutil
+import string
+import tempfile
+import timeit
+from pathlib import Path
+
+from nlp.dictionary_snapshot import (
+    DATA_DIR, SOURCE_FILES, build_snapshot, load_dictionaries, source_checksum, write_snapshot,
+)
+
+
+SYNTHETIC_ENTRIES = 90_000
+
+
+# ---------- Inputs ----------
+
+def synthetic_data_dir(entries: int) -> Path:
+    """
+    Temporary data directory with entries one- to three-word phrases,
+    split over the SOURCE_FILES (technical skills get half).
+    """
+    rng = random.Random(42)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(20_000)]
+    phrases = sorted({" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(entries)})
+    rng.shuffle(phrases)
+
+    directory = Path(tempfile.mkdtemp(prefix="bench_dictionaries_"))
+    half = len(phrases) // 2
+    parts = {"technical": phrases[:half], "soft": phrases[half:half + half // 2], "jd_keyword": phrases[half + half // 2:]}
+    for label, name in SOURCE_FILES.items():
+        (directory / name).write_text("\n".join(parts[label]) + "\n", encoding="utf-8")
+    return directory
+
+
+# ---------- Main ----------
+
+def compare(label: str, data_dir: Path, repeat: int):
+    snapshot_path = Path(tempfile.mkdtemp(prefix="bench_snapshot_")) / "dictionaries.snapshot.pkl"
+    try:
+        cold = min(timeit.repeat(lambda: load_dictionaries(data_dir, snapshot_path), number=1, repeat=repeat))
+
+        write_snapshot(build_snapshot(data_dir, source_checksum(data_dir)), snapshot_path)
+        warm = min(timeit.repeat(lambda: load_dictionaries(data_dir, snapshot_path), number=1, repeat=repeat))
+
+        same = load_dictionaries(data_dir, snapshot_path)["lists"] == build_snapshot(data_dir)["lists"]
+        entries = sum(len(items) for items in build_snapshot(data_dir)["lists"].values())
+        print(f"{label:<10} {entries:>8} {cold * 1000:>10.1f} {warm * 1000:>10.1f} {cold / warm:>8.1f}x"
+              f"  {'same lists' if same else '[ERROR] lists differ'}")
+    finally:
+        shutil.rmtree(snapshot_path.parent, ignore_errors=True)
+
+
+def main():
+    print(f"{'data':<10} {'entries':>8} {'build ms':>10} {'load ms':>10} {'speedup':>9}")
+    compare("data/", DATA_DIR, repeat=20)
+
+    synthetic = synthetic_data_dir(SYNTHETIC_ENTRIES)
+    try:
+        compare("synthetic", synthetic, repeat=3)
+    finally:
+        shutil.rmtree(synthetic, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark for services/matcher.py.
+
+Compares the latency of every match mode on growing inputs and how
+closely the shingle modes track the original SequenceMatcher ratio
+(Pearson and Spearman correlation over random resume / JD pairs).
+
+    python -m benchmarks.bench_matcher
+"""
+import random
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from services.matcher import MATCH_MODES, calculate_match_score
+
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DOCS_DIR = BASE_DIR / "docs"
+DATA_DIR = BASE_DIR / "data"
+
+
+# ---------- Inputs ----------
+
+def word_pool() -> list:
+    words = []
+    for path in list(DOCS_DIR.glob("*.txt")) + list(DATA_DIR.glob("*.txt")):
+        words += path.read_text(encoding="utf-8", errors="ignore").split()
+    return words or "python sql developer experience team data analysis".split()
+
+
+def make_text(rng: random.Random, pool: list, size: int, shared: list = None, overlap: float = 0.0) -> str:
+    """
+    About size characters of words from the pool; a share `overlap` of
+    the words is copied in runs from `shared` so pairs vary in similarity.
+    """
+    words, length = [], 0
+    while length < size:
+        if shared and rng.random() < overlap:
+            start = rng.randrange(len(shared))
+            chunk = shared[start:start + rng.randint(2, 8)]
+        else:
+            chunk = [rng.choice(pool)]
+        words += chunk
+        length += sum(len(w) + 1 for w in chunk)
+    return " ".join(words)
+
+
+def make_pairs(n: int, resume_size: int, jd_size: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    pool = word_pool()
+    pairs = []
+    for _ in range(n):
+        jd = make_text(rng, pool, jd_size)
+        resume = make_text(rng, pool, resume_size, shared=jd.split(), overlap=rng.random())
+        pairs.append((resume, jd))
+    return pairs
+
+
+# ---------- Statistics ----------
+
+def ranks(values: np.ndarray) -> np.ndarray:
+    order = values.argsort(kind="mergesort")
+    result = np.empty(len(values))
+    result[order] = np.arange(len(values))
+    # Average the ranks of ties
+    for value in np.unique(values):
+        mask = values == value
+        if mask.sum() > 1:
+            result[mask] = result[mask].mean()
+    return result
+
+
+def pearson(a: np.ndarray, b: np.ndarray) -> float:
+    if a.std() == 0 or b.std() == 0:
+        return float("nan")
+    return float(np.corrcoef(a, b)[0, 1])
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    return pearson(ranks(a), ranks(b))
+
+
+# ---------- Main ----------
+
+def main():
+    print("Latency per comparison (ms), JD = 5 KB, no length cap")
+    print(f"{'resume':>8} " + " ".join(f"{mode:>12}" for mode in MATCH_MODES))
+    for resume_size in (1_000, 5_000, 20_000):
+        resume, jd = make_pairs(1, resume_size, 5_000)[0]
+        row = []
+        for mode in MATCH_MODES:
+            runs = 1 if mode == "sequence" else 20
+            seconds = min(timeit.repeat(lambda: calculate_match_score(resume, jd, mode=mode, max_chars=0),
+                                        number=runs, repeat=3)) / runs
+            row.append(seconds * 1000)
+        print(f"{resume_size // 1000:>6} KB " + " ".join(f"{ms:>12.2f}" for ms in row))
+
+    pairs = make_pairs(200, 1_500, 800)
+    reference = np.array([calculate_match_score(r, j, mode="sequence", max_chars=0) for r, j in pairs])
+
+    print("\nAgreement with the sequence ratio (200 pairs)")
+    print(f"{'mode':>12} {'pearson':>8} {'spearman':>9}")
+    for mode in MATCH_MODES[1:]:
+        scores = np.array([calculate_match_score(r, j, mode=mode, max_chars=0) for r, j in pairs])
+        print(f"{mode:>12} {pearson(reference, scores):>8.3f} {spearman(reference, scores):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
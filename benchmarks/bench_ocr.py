@@ -0,0 +1,85 @@
+"""
+Benchmark for parallel page OCR in document_pytesseract.py.
+
+Renders a synthetic image-only ("scanned") PDF and times extract_text
+on it for growing OCR_WORKERS, showing how wall-clock time per document
+scales with the pool size. Needs Tesseract and Poppler installed.
+
+    python -m benchmarks.bench_ocr [pages]
+"""
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+import document_pytesseract
+from benchmarks.bench_matcher import word_pool
+
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+# ---------- Inputs ----------
+
+def make_scanned_pdf(path: Path, pages: int, seed: int = 42):
+    """
+    A PDF of `pages` rendered text pages with no text layer, so every
+    page takes the OCR path.
+    """
+    rng = random.Random(seed)
+    pool = word_pool()
+    images = []
+    for _ in range(pages):
+        image = Image.new("L", (1275, 1650), 255)     # Letter at 150 DPI
+        draw = ImageDraw.Draw(image)
+        for row in range(60):
+            line = " ".join(rng.choice(pool) for _ in range(12))
+            draw.text((60, 60 + row * 25), line, fill=0)
+        images.append(image)
+    images[0].save(path, "PDF", resolution=150, save_all=True, append_images=images[1:])
+
+
+# ---------- Main ----------
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    if not document_pytesseract.PDF_SUPPORT:
+        print("pdf2image is not installed")
+        return
+    tesseract = shutil.which("tesseract")
+    if tesseract:
+        document_pytesseract.pytesseract.pytesseract.tesseract_cmd = tesseract
+    # The extraction cache key covers OCR output settings but not the
+    # worker count, so with the cache on every run after the first would
+    # time a cache read instead of OCR.
+    document_pytesseract.EXTRACTION_CACHE = None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "scan.pdf"
+        make_scanned_pdf(path, pages)
+
+        print(f"Wall-clock per document ({pages} scanned pages)")
+        print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+        baseline = None
+        for workers in WORKER_COUNTS:
+            document_pytesseract.OCR_WORKERS = workers
+            document_pytesseract.OCR_MAX_WORKERS_PER_DOCUMENT = workers
+            document_pytesseract.shutdown_ocr_pool()
+            # Warm-up starts the pool processes outside the timing
+            warm_up = {page: document_pytesseract.OCR_DPI for page in range(1, min(workers, pages) + 1)}
+            document_pytesseract.ocr_pdf_pages(str(path), warm_up)
+
+            start = time.perf_counter()
+            document_pytesseract.extract_text(str(path))
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{workers:>8} {seconds:>9.2f} {baseline / seconds:>7.1f}x")
+        document_pytesseract.shutdown_ocr_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark for nlp/preprocess.py.
+
+Checks that the compiled normalizer gives exactly the same clean text
+and tokens as the original multi-pass implementation, then reports
+the speedup.
+
+    python -m benchmarks.bench_preprocess
+"""
+import random
+import re
+import string
+import timeit
+from pathlib import Path
+
+from nlp.preprocess import STOPWORDS, clean_text, preprocess
+
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+DOCS_DIR = BASE_DIR / "docs"
+
+
+# ---------- Original implementation (reference) ----------
+
+def legacy_clean_text(text: str) -> str:
+    if not text:
+        return ""
+    text = text.lower()
+    text = re.sub(r"http\S+|www\.\S+", " ", text)
+    text = re.sub(r"\S+@\S+", " ", text)
+    text = re.sub(r"\d+", " ", text)
+    text = text.translate(str.maketrans("", "", string.punctuation))
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def legacy_preprocess(text: str) -> dict:
+    cleaned = legacy_clean_text(text)
+    tokens = cleaned.split(" ") if cleaned else []
+    tokens = [t for t in tokens if t and t not in STOPWORDS]
+    return {"clean_text": " ".join(tokens), "tokens": tokens}
+
+
+# ---------- Inputs ----------
+
+def sample_texts() -> list:
+    texts = []
+    for name in ("resume_sample.txt", "jd_sample.txt", "sample.txt", "input.txt"):
+        path = DOCS_DIR / name
+        if path.exists():
+            texts.append(path.read_text(encoding="utf-8", errors="ignore"))
+
+    # Edge cases around URLs, emails, numbers and unicode whitespace
+    texts += [
+        "", "   ", "a@b", "@x", "x@", "foo@http://x", "xhttp@y z", "mail me: A.B@Example.COM!",
+        "see www.site.com/path?q=1 or http://a.b", "3+ years, 10yrs; 2019-2023", "tabs\tand\nnew lines ok",
+        "C++/C#, Node.js & CI/CD", "١٢٣ arabic digits", "ÀÉÎ accents", "don't won't", "a1@b2 9@9 @@x 1@",
+    ]
+
+    rng = random.Random(42)
+    alphabet = "abcXYZ019 @./:-+_\t\nhttpwwwé١\u2003İ"
+    texts += ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 200))) for _ in range(2000)]
+    return texts
+
+
+def large_resume() -> str:
+    """
+    ~40 KB OCR-like resume built from the samples.
+    """
+    base = "\n".join(sample_texts()[:4]) or "Python developer with 3 years of experience."
+    extra = " Contact: jane.doe@example.com, https://github.com/jane, +1 555 0100. "
+    text = base + extra
+    return text * max(1, 40_000 // len(text))
+
+
+# ---------- Main ----------
+
+def main():
+    texts = sample_texts()
+    mismatches = [t for t in texts if preprocess(t) != legacy_preprocess(t) or clean_text(t) != legacy_clean_text(t)]
+    print(f"Equality check : {len(texts) - len(mismatches)}/{len(texts)} inputs identical")
+    if mismatches:
+        print(f"[ERROR] first mismatch: {mismatches[0]!r}")
+        return
+
+    doc = large_resume()
+    runs = 50
+    old = min(timeit.repeat(lambda: legacy_preprocess(doc), number=runs, repeat=5)) / runs
+    new = min(timeit.repeat(lambda: preprocess(doc), number=runs, repeat=5)) / runs
+
+    print(f"Document size  : {len(doc) / 1024:.1f} KB")
+    print(f"Legacy         : {old * 1000:.2f} ms")
+    print(f"Compiled       : {new * 1000:.2f} ms")
+    print(f"Speedup        : {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
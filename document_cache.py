@@ -0,0 +1,169 @@
+# document_cache.py
+
+import hashlib
+import json
+import os
+import threading
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+# Extracted documents on disk, keyed by file content ("" disables)
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", os.path.join(BASE_DIR, "instance", "extraction_cache"))
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Eviction trims the cache to this share of max_bytes, so it does not run
+# again on the very next write
+EVICT_TO = 0.9
+
+HASH_CHUNK = 1024 * 1024
+
+
+# ---------- Content-addressed extraction cache ----------
+
+class ExtractionCache:
+    """
+    Extraction results stored as JSON files under directory, keyed by the
+    SHA-256 of the file bytes plus the extractor version and settings, so
+    the same upload (re-applications, several recruiters, retries) is
+    extracted once.
+
+    - max_bytes: total size of the cached files; the least recently used
+      entries (by file mtime, refreshed on every hit) are evicted.
+    - Entries are shared by all processes using the same directory.
+    """
+
+    def __init__(self, directory, max_bytes=EXTRACTION_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+
+        self._lock = threading.Lock()
+        self._total_bytes = None        # scanned on first write
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    def key(self, file_path, version, settings=None):
+        """
+        SHA-256 of (version, settings, file bytes). settings: everything
+        besides the file that changes the extracted text (e.g. OCR DPI).
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([str(version), settings or {}], sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key):
+        """
+        Cached extraction for a key, or None.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARN] Could not write extraction cache entry: {e}")
+            return
+
+        with self._lock:
+            self.writes += 1
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += size
+            if self.max_bytes and self._total_bytes > self.max_bytes:
+                self._evict()
+
+    # ---------- Eviction ----------
+
+    def _entries(self):
+        """
+        [(mtime, size, path)] of every cached file.
+        """
+        entries = []
+        try:
+            buckets = list(os.scandir(self.directory))
+        except OSError:
+            return entries
+        for bucket in buckets:
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """
+        Remove least recently used entries until the cache is back under
+        EVICT_TO * max_bytes. Scans the directory, so entries written by
+        other processes are counted too.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TO
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._total_bytes = total
+
+    # ---------- Statistics ----------
+
+    def clear_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.writes = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            lookups = self.hits + self.misses
+            return {
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+EXTRACTION_CACHE = ExtractionCache(EXTRACTION_CACHE_DIR) if EXTRACTION_CACHE_DIR else None
@@ -2,43 +2,563 @@
 
 import pytesseract
 from PIL import Image
+import math
+import multiprocessing
 import os
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from document_cache import EXTRACTION_CACHE
 
 # Optional: import pdf2image if installed
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     PDF_SUPPORT = True
 except ImportError:
     PDF_SUPPORT = False
 
+# Embedded text layer of born-digital PDFs
+try:
+    from PyPDF2 import PdfReader
+    TEXT_LAYER_SUPPORT = True
+except ImportError:
+    TEXT_LAYER_SUPPORT = False
+
+# Word documents (.docx)
+try:
+    import docx
+    DOCX_SUPPORT = True
+except ImportError:
+    DOCX_SUPPORT = False
+
 # Set path to Tesseract executable
 pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
 
-def extract_text(file_path):
+# Pages whose text layer has fewer letters/digits than this are OCR'd
+MIN_PAGE_TEXT_CHARS = int(os.getenv("MIN_PAGE_TEXT_CHARS", 25))
+
+# OCR process pool shared by all uploads of this server process, and how
+# many of its workers a single document may occupy at once (1 = OCR pages
+# in this process). Every gunicorn worker has its own pool, so keep
+# OCR_WORKERS x gunicorn workers near the number of CPUs.
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", min(2, os.cpu_count() or 1)))
+OCR_MAX_WORKERS_PER_DOCUMENT = int(os.getenv("OCR_MAX_WORKERS_PER_DOCUMENT", 4))
+
+# Rasterization: pages are rendered OCR_PAGE_WINDOW at a time and released
+# once OCR'd, so memory stays flat however long the PDF is
+OCR_DPI = int(os.getenv("OCR_DPI", 200))
+OCR_MIN_DPI = int(os.getenv("OCR_MIN_DPI", 100))
+OCR_GRAYSCALE = os.getenv("OCR_GRAYSCALE", "1").lower() in ("1", "true", "yes")
+OCR_PAGE_WINDOW = int(os.getenv("OCR_PAGE_WINDOW", 4))
+
+# Pixel budgets (0 = unlimited). Oversized pages are rendered at a lower
+# DPI; a document over budget is rendered at lower DPI down to
+# OCR_MIN_DPI, and pages beyond the budget after that are skipped.
+OCR_MAX_PAGE_PIXELS = int(os.getenv("OCR_MAX_PAGE_PIXELS", 12_000_000))
+OCR_MAX_DOCUMENT_PIXELS = int(os.getenv("OCR_MAX_DOCUMENT_PIXELS", 400_000_000))
+
+# Page size (points) when the PDF does not tell us: US Letter
+DEFAULT_PAGE_SIZE = (612.0, 792.0)
+
+# Part of the extraction cache key: bump whenever extraction changes
+EXTRACTOR_VERSION = 2
+
+# Bytes read to detect the file type
+SNIFF_BYTES = 8192
+
+_ocr_pool = None
+
+
+# ---------- OCR Pool ----------
+
+def get_ocr_pool():
+    global _ocr_pool
+    if _ocr_pool is None:
+        # spawn, not fork: forking a threaded server process can copy
+        # locks held by other threads into the workers and deadlock them
+        _ocr_pool = ProcessPoolExecutor(max_workers=OCR_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+    return _ocr_pool
+
+
+def shutdown_ocr_pool():
+    global _ocr_pool
+    if _ocr_pool is not None:
+        _ocr_pool.shutdown(wait=True)
+        _ocr_pool = None
+
+
+def ocr_pdf_window(file_path, first_page, last_page, dpi):
+    """
+    OCR the PDF pages first_page..last_page (1-based) rendered at dpi.
+    Only this window is rasterized and each image is released as soon as
+    it is OCR'd, so it can run in a pool worker without shipping images
+    between processes.
+    """
+    images = convert_from_path(file_path, dpi=dpi, first_page=first_page,
+                               last_page=last_page, grayscale=OCR_GRAYSCALE)
+    texts = []
+    while images:
+        image = images.pop(0)
+        texts.append(pytesseract.image_to_string(image))
+        image.close()
+    return texts
+
+
+def page_windows(page_dpis, size):
+    """
+    Group {page_number: dpi} into (first_page, last_page, dpi) windows of
+    at most size consecutive pages rendered at the same DPI.
+    """
+    windows = []
+    for number, dpi in page_dpis.items():
+        if windows:
+            first, last, window_dpi = windows[-1]
+            if number == last + 1 and dpi == window_dpi and number - first < size:
+                windows[-1] = (first, number, dpi)
+                continue
+        windows.append((number, number, dpi))
+    return windows
+
+
+def ocr_pdf_pages(file_path, page_dpis):
+    """
+    {page_number: text} for the PDF pages in {page_number: dpi}. Windows of
+    pages are spread over the shared pool, keeping at most
+    OCR_MAX_WORKERS_PER_DOCUMENT of them in flight so one long scan cannot
+    queue ahead of every other upload.
+
+    A window whose OCR fails is logged and left out of the result, so the
+    rest of the document survives.
+    """
+    global _ocr_pool
+    workers = min(OCR_WORKERS, OCR_MAX_WORKERS_PER_DOCUMENT, len(page_dpis))
+    # Smaller windows when there are fewer pages than workers * window
+    size = max(1, min(OCR_PAGE_WINDOW, math.ceil(len(page_dpis) / max(workers, 1))))
+    windows = page_windows(page_dpis, size)
+
+    results = {}
+    if workers <= 1:
+        for first, last, dpi in windows:
+            try:
+                results.update(zip(range(first, last + 1), ocr_pdf_window(file_path, first, last, dpi)))
+            except Exception as e:
+                print(f"[WARN] {file_path}: OCR of pages {first}-{last} failed: {e}")
+        return results
+
+    pool = get_ocr_pool()
+    queue = iter(windows)
+    in_flight = {}
+    try:
+        for window in queue:
+            in_flight[pool.submit(ocr_pdf_window, file_path, *window)] = window
+            if len(in_flight) == workers:
+                break
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                first, last, _ = in_flight.pop(future)
+                try:
+                    results.update(zip(range(first, last + 1), future.result()))
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    print(f"[WARN] {file_path}: OCR of pages {first}-{last} failed: {e}")
+                window = next(queue, None)
+                if window is not None:
+                    in_flight[pool.submit(ocr_pdf_window, file_path, *window)] = window
+    except BrokenProcessPool as e:
+        # A worker died (e.g. out of memory): the pages not OCR'd yet fail,
+        # and a fresh pool is started next time
+        print(f"[WARN] {file_path}: OCR pool broke, {len(page_dpis) - len(results)} pages not OCR'd: {e}")
+        _ocr_pool = None
+    finally:
+        for future in in_flight:
+            future.cancel()
+    return results
+
+
+# ---------- Render Budget ----------
+
+def page_pixels(size, dpi):
+    width, height = size
+    return (width / 72 * dpi) * (height / 72 * dpi)
+
+
+def plan_render_dpi(page_sizes):
+    """
+    Render DPI for each page to OCR, {page_number: (width_pt, height_pt)}
+    -> {page_number: dpi}, within the page and document pixel budgets.
+    Pages that do not fit the document budget even at OCR_MIN_DPI are
+    left out.
+    """
+    page_dpis = {}
+    for number, size in page_sizes.items():
+        dpi = OCR_DPI
+        if OCR_MAX_PAGE_PIXELS and page_pixels(size, dpi) > OCR_MAX_PAGE_PIXELS:
+            dpi = int(dpi * math.sqrt(OCR_MAX_PAGE_PIXELS / page_pixels(size, dpi)))
+        page_dpis[number] = max(dpi, 1)
+
+    if not OCR_MAX_DOCUMENT_PIXELS:
+        return page_dpis
+    total = sum(page_pixels(page_sizes[n], dpi) for n, dpi in page_dpis.items())
+    if total <= OCR_MAX_DOCUMENT_PIXELS:
+        return page_dpis
+
+    scale = math.sqrt(OCR_MAX_DOCUMENT_PIXELS / total)
+    budget = OCR_MAX_DOCUMENT_PIXELS
+    planned = {}
+    for number, dpi in page_dpis.items():
+        dpi = max(int(dpi * scale), min(dpi, OCR_MIN_DPI))
+        budget -= page_pixels(page_sizes[number], dpi)
+        if budget < 0:
+            break
+        planned[number] = dpi
+    return planned
+
+
+# ---------- PDF Pages ----------
+
+def has_usable_text(text):
+    """
+    True when a text layer holds enough letters/digits to be real content
+    (scanned pages have none, or a few stray characters).
+    """
+    return sum(ch.isalnum() for ch in text or "") >= MIN_PAGE_TEXT_CHARS
+
+
+def read_pdf_pages(file_path):
+    """
+    [(text, (width_pt, height_pt))] for every PDF page, the text coming
+    from the embedded text layer ("" for pages without one), or None when
+    the file cannot be read.
+    """
+    if not TEXT_LAYER_SUPPORT:
+        return None
+    try:
+        reader = PdfReader(file_path)
+        if reader.is_encrypted:
+            reader.decrypt("")
+        return [
+            (page.extract_text() or "", (float(page.mediabox.width), float(page.mediabox.height)))
+            for page in reader.pages
+        ]
+    except Exception as e:
+        print(f"[WARN] No readable text layer in {file_path}: {e}")
+        return None
+
+
+def pdfinfo_pages(file_path):
+    """
+    [("", (width_pt, height_pt))] for every page, from Poppler's pdfinfo
+    (which reports the size of the first page only).
+    """
+    info = pdfinfo_from_path(file_path)  # Poppler must be in PATH
+    try:
+        width, _, height = info["Page size"].split()[:3]
+        size = (float(width), float(height))
+    except (KeyError, ValueError):
+        size = DEFAULT_PAGE_SIZE
+    return [("", size)] * int(info["Pages"])
+
+
+def extract_pdf_pages(file_path):
+    """
+    Tiered PDF extraction: the text layer page by page, OCR only for the
+    pages whose text layer is empty or implausibly short.
+
+    Returns [(text, source)] in page order, source being "text" (text
+    layer), "ocr", "failed" (OCR raised; the text layer is kept),
+    "skipped" (short page over the pixel budget) or "none" (short page,
+    OCR unavailable).
+    """
+    pages = read_pdf_pages(file_path)
+    if pages is None:
+        if not PDF_SUPPORT:
+            return []
+        # No text layer at all: OCR every page
+        pages = pdfinfo_pages(file_path)
+
+    ocr_text = {}
+    page_dpis = {}
+    if PDF_SUPPORT:
+        short_pages = {
+            number: size for number, (text, size) in enumerate(pages, start=1)
+            if not has_usable_text(text)
+        }
+        page_dpis = plan_render_dpi(short_pages)
+        if len(page_dpis) < len(short_pages):
+            print(f"[WARN] {file_path}: OCR of {len(short_pages) - len(page_dpis)} pages "
+                  f"skipped (over the pixel budget)")
+        if page_dpis:
+            ocr_text = ocr_pdf_pages(file_path, page_dpis)
+
+    results = []
+    for number, (text, _) in enumerate(pages, start=1):
+        if number in ocr_text:
+            results.append((ocr_text[number], "ocr"))
+        elif has_usable_text(text):
+            results.append((text, "text"))
+        elif number in page_dpis:
+            results.append((text, "failed"))
+        elif PDF_SUPPORT:
+            results.append((text, "skipped"))
+        else:
+            results.append((text, "none"))
+    return results
+
+
+# ---------- File Types ----------
+
+IMAGE_SIGNATURES = (
+    b"\x89PNG\r\n\x1a\n",           # PNG
+    b"\xff\xd8\xff",                # JPEG
+    b"II*\x00", b"MM\x00*",         # TIFF
+    b"GIF87a", b"GIF89a",
+)
+
+
+def is_image(head):
+    if head.startswith(IMAGE_SIGNATURES):
+        return True
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return True
+    # BMP: "BM", then the file size and four reserved zero bytes
+    return head[:2] == b"BM" and head[6:10] == b"\x00\x00\x00\x00"
+
+
+def sniff_format(file_path):
+    """
+    Real type of a file from its leading bytes, whatever its extension:
+    "pdf", "docx", "rtf", "image", "text" or None (unknown / binary).
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        # DOCX is a zip with the document under word/
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                names = archive.namelist()
+        except zipfile.BadZipFile:
+            return None
+        return "docx" if "word/document.xml" in names else None
+    if head.startswith(b"{\\rtf"):
+        return "rtf"
+    if is_image(head):
+        return "image"
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "text"               # UTF-16 with BOM
+    # Plain text: no NUL bytes and hardly any other control characters
+    control = sum(byte < 9 or 13 < byte < 32 for byte in head)
+    if b"\x00" not in head and control <= len(head) // 100:
+        return "text"
+    return None
+
+
+def read_text_file(file_path):
+    with open(file_path, "rb") as f:
+        data = f.read()
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16", errors="replace")
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+
+def extract_docx_text(file_path):
+    """
+    Paragraphs, then table cells (row by row), of a Word document.
+    """
+    document = docx.Document(file_path)
+    lines = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            cells = []
+            for cell in row.cells:
+                # Merged cells repeat in every column they span
+                if not cells or cell.text != cells[-1]:
+                    cells.append(cell.text)
+            lines.append(" | ".join(cells))
+    return "\n".join(lines)
+
+
+# ---------- RTF ----------
+
+# Groups that hold formatting or metadata rather than document text
+RTF_SKIP_DESTINATIONS = {
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "header", "footer",
+    "headerl", "headerr", "footerl", "footerr", "listtable", "listoverridetable",
+    "themedata", "colorschememapping", "latentstyles", "datastore", "object",
+}
+RTF_SPECIAL_WORDS = {"par": "\n", "line": "\n", "row": "\n", "tab": "\t", "cell": " | "}
+
+_RTF_TOKEN = re.compile(
+    r"\\([a-zA-Z]+)(-?\d+)? ?"          # control word with optional parameter
+    r"|\\'([0-9a-fA-F]{2})"             # hex-escaped byte
+    r"|\\(.)"                           # control symbol
+    r"|([{}])"
+    r"|[\r\n]+"                         # source line breaks carry no meaning
+    r"|([^\\{}\r\n]+)",
+    re.DOTALL,
+)
+
+
+def rtf_to_text(rtf):
     """
-    Extract text from an image or PDF file.
-    Works on Windows. Requires Poppler installed for PDFs.
+    Plain text of an RTF document: control words dropped, metadata groups
+    skipped, \\par as line breaks, \\'hh and \\uN escapes decoded.
+    """
+    out = []
+    stack = []              # (skip, unicode fallback length) per open group
+    skip = False
+    fallback = 1            # \ucN: characters following \uN to ignore
+    pending = 0             # fallback characters still to ignore
+
+    for match in _RTF_TOKEN.finditer(rtf):
+        word, arg, hex_code, symbol, brace, text = match.groups()
+        if brace == "{":
+            stack.append((skip, fallback))
+        elif brace == "}":
+            skip, fallback = stack.pop() if stack else (False, 1)
+            pending = 0
+        elif word:
+            if word in RTF_SKIP_DESTINATIONS:
+                skip = True
+            elif word == "uc":
+                fallback = int(arg or 1)
+            elif word == "u" and not skip:
+                out.append(chr(int(arg) % 65536))
+                pending = fallback
+            elif word in RTF_SPECIAL_WORDS and not skip:
+                out.append(RTF_SPECIAL_WORDS[word])
+        elif hex_code:
+            if pending:
+                pending -= 1
+            elif not skip:
+                out.append(bytes([int(hex_code, 16)]).decode("cp1252", errors="replace"))
+        elif symbol:
+            if symbol == "*":
+                skip = True         # ignorable destination
+            elif symbol in "\\{}" and not skip:
+                out.append(symbol)
+            elif symbol == "~" and not skip:
+                out.append(" ")
+        elif text and not skip:
+            if pending:
+                drop = min(pending, len(text))
+                text, pending = text[drop:], pending - drop
+            out.append(text)
+    return "".join(out)
+
+
+# ---------- Extraction ----------
+
+def extraction_settings(file_path):
+    """
+    Everything besides the file bytes that changes the extracted text;
+    part of the extraction cache key.
+    """
+    return {
+        "pdf_support": PDF_SUPPORT,
+        "text_layer_support": TEXT_LAYER_SUPPORT,
+        "docx_support": DOCX_SUPPORT,
+        "min_page_text_chars": MIN_PAGE_TEXT_CHARS,
+        "dpi": OCR_DPI,
+        "min_dpi": OCR_MIN_DPI,
+        "grayscale": OCR_GRAYSCALE,
+        "max_page_pixels": OCR_MAX_PAGE_PIXELS,
+        "max_document_pixels": OCR_MAX_DOCUMENT_PIXELS,
+    }
+
+
+def extract_document(file_path):
+    """
+    Extract text from a PDF, Word (.docx), RTF, plain text or image file,
+    recording the detected format and per page how the text was obtained:
+    {"format": str, "text": str, "pages": [{"page", "source", "chars"}]}.
+
+    Results are cached by file content (document_cache.py), looked up
+    before any rasterization, so a repeated upload costs only a hash.
+    """
+    key = None
+    if EXTRACTION_CACHE is not None:
+        try:
+            key = EXTRACTION_CACHE.key(file_path, EXTRACTOR_VERSION, extraction_settings(file_path))
+        except OSError as e:
+            print(f"[WARN] Could not hash {file_path}: {e}")
+        else:
+            cached = EXTRACTION_CACHE.get(key)
+            if cached is not None:
+                return cached
+
+    result, complete = _extract_document(file_path)
+    if key is not None and complete:
+        EXTRACTION_CACHE.put(key, result)
+    return result
+
+
+def _extract_document(file_path):
+    """
+    (result, complete): complete is False when the file type is not
+    supported or extraction (or OCR of any page) failed, and the result
+    must not be cached.
     """
     ext = os.path.splitext(file_path)[1].lower()  # Get file extension
-    text = ""
+    file_format = None
+    pages = []
+    complete = False
 
     try:
-        if ext in ['.jpg', '.jpeg', '.png']:
-            # Image file
-            img = Image.open(file_path)
-            text = pytesseract.image_to_string(img)
+        # Dispatch on the content, not the extension
+        file_format = sniff_format(file_path)
 
-        elif ext == '.pdf' and PDF_SUPPORT:
+        if file_format == "pdf" and (PDF_SUPPORT or TEXT_LAYER_SUPPORT):
             # PDF file
-            pages = convert_from_path(file_path)  # Poppler must be in PATH
-            for page in pages:
-                text += pytesseract.image_to_string(page)
+            pages = extract_pdf_pages(file_path)
+
+        elif file_format == "docx" and DOCX_SUPPORT:
+            pages = [(extract_docx_text(file_path), "text")]
+
+        elif file_format == "rtf":
+            pages = [(rtf_to_text(read_text_file(file_path)), "text")]
+
+        elif file_format == "text":
+            pages = [(read_text_file(file_path), "text")]
+
+        elif file_format == "image":
+            # Image file: the only format that always needs OCR
+            img = Image.open(file_path)
+            pages = [(pytesseract.image_to_string(img), "ocr")]
 
         else:
-            print(f"Unsupported file type: {ext} or pdf2image not installed.")
-    
+            print(f"Unsupported file type: {ext} (detected: {file_format or 'unknown'}) "
+                  f"or its library is not installed.")
+
+        # Failed OCR may succeed on a retry: keep it out of the cache
+        complete = bool(pages) and all(source != "failed" for _, source in pages)
+
     except Exception as e:
         print(f"Error extracting text: {e}")
-    
-    return text
 
+    return {
+        "format": file_format,
+        "text": "\n".join(text.strip("\n") for text, _ in pages),
+        "pages": [
+            {"page": number, "source": source, "chars": len(text)}
+            for number, (text, source) in enumerate(pages, start=1)
+        ],
+    }, complete
+
+
+def extract_text(file_path):
+    """
+    Extract text from a PDF, Word (.docx), RTF, plain text or image file.
+    Works on Windows. Requires Poppler installed for scanned PDFs.
+    """
+    return extract_document(file_path)["text"]
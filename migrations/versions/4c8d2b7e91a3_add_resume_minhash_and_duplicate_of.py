@@ -0,0 +1,33 @@
+"""add resume minhash and duplicate_of
+
+Revision ID: 4c8d2b7e91a3
+Revises: 9a1f3e5c7b20
+Create Date: 2026-10-17 09:41:12.208311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8d2b7e91a3'
+down_revision = '9a1f3e5c7b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # batch mode: SQLite can only add a foreign key by recreating the table
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('minhash', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('duplicate_of', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_resumes_duplicate_of'), ['duplicate_of'], unique=False)
+        batch_op.create_foreign_key('fk_resumes_duplicate_of_resumes', 'resumes', ['duplicate_of'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_resumes_duplicate_of_resumes', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_resumes_duplicate_of'))
+        batch_op.drop_column('duplicate_of')
+        batch_op.drop_column('minhash')
@@ -0,0 +1,65 @@
+"""create jobs and scoring_results tables
+
+Revision ID: 7e2a9c4f1d68
+Revises: 4c8d2b7e91a3
+Create Date: 2026-10-17 10:01:12.208317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e2a9c4f1d68'
+down_revision = '4c8d2b7e91a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('company', sa.String(length=255), nullable=True),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('required_skills', sa.Text(), nullable=True),
+    sa.Column('preferred_skills', sa.Text(), nullable=True),
+    sa.Column('experience_level', sa.String(length=50), nullable=True),
+    sa.Column('education_requirements', sa.Text(), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('remote_ok', sa.Boolean(), nullable=True),
+    sa.Column('salary_min', sa.Integer(), nullable=True),
+    sa.Column('salary_max', sa.Integer(), nullable=True),
+    sa.Column('job_type', sa.String(length=50), nullable=True),
+    sa.Column('keywords', sa.Text(), nullable=True),
+    sa.Column('processed', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('scoring_results',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('overall_score', sa.Float(), nullable=False),
+    sa.Column('skills_score', sa.Float(), nullable=True),
+    sa.Column('experience_score', sa.Float(), nullable=True),
+    sa.Column('education_score', sa.Float(), nullable=True),
+    sa.Column('reasoning_points', sa.Text(), nullable=True),
+    sa.Column('skill_matches', sa.Text(), nullable=True),
+    sa.Column('experience_analysis', sa.Text(), nullable=True),
+    sa.Column('education_analysis', sa.Text(), nullable=True),
+    sa.Column('ai_model_used', sa.String(length=100), nullable=True),
+    sa.Column('processing_time', sa.Float(), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=True),
+    sa.Column('batch_id', sa.String(length=100), nullable=True),
+    sa.Column('scored_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('scoring_results')
+    op.drop_table('jobs')
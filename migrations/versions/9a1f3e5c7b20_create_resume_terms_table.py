@@ -0,0 +1,38 @@
+"""create resume_terms table
+
+Revision ID: 9a1f3e5c7b20
+Revises: ef5a9f774da3
+Create Date: 2026-10-17 09:12:05.531907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a1f3e5c7b20'
+down_revision = 'ef5a9f774da3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resume_terms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('field', sa.String(length=50), nullable=False),
+    sa.Column('term', sa.String(length=255), nullable=False),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('resume_terms', schema=None) as batch_op:
+        batch_op.create_index('ix_resume_terms_field_term', ['field', 'term'], unique=False)
+        batch_op.create_index(batch_op.f('ix_resume_terms_resume_id'), ['resume_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resume_terms', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resume_terms_resume_id'))
+        batch_op.drop_index('ix_resume_terms_field_term')
+
+    op.drop_table('resume_terms')
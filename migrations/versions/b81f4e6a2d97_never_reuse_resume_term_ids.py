@@ -0,0 +1,29 @@
+"""never reuse resume_terms ids
+
+Revision ID: b81f4e6a2d97
+Revises: d3b6f0a2c815
+Create Date: 2026-10-17 11:24:51.730194
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b81f4e6a2d97'
+down_revision = 'd3b6f0a2c815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SQLite only honours AUTOINCREMENT from CREATE TABLE
+    with op.batch_alter_table('resume_terms', schema=None, recreate='always',
+                              table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+        pass
+
+
+def downgrade():
+    with op.batch_alter_table('resume_terms', schema=None, recreate='always',
+                              table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+        pass
@@ -0,0 +1,26 @@
+"""add scoring result keywords_score
+
+Revision ID: d3b6f0a2c815
+Revises: 7e2a9c4f1d68
+Create Date: 2026-10-17 10:03:48.964120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3b6f0a2c815'
+down_revision = '7e2a9c4f1d68'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('scoring_results', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('keywords_score', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('scoring_results', schema=None) as batch_op:
+        batch_op.drop_column('keywords_score')
@@ -0,0 +1,47 @@
+"""create resumes table
+
+Revision ID: ef5a9f774da3
+Revises: 
+Create Date: 2025-09-14 11:02:37.412583
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ef5a9f774da3'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resumes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('original_filename', sa.String(length=255), nullable=False),
+    sa.Column('file_path', sa.String(length=255), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('mime_type', sa.String(length=100), nullable=True),
+    sa.Column('raw_text', sa.Text(), nullable=True),
+    sa.Column('processed_text', sa.Text(), nullable=True),
+    sa.Column('candidate_name', sa.String(length=255), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('skills', sa.Text(), nullable=True),
+    sa.Column('experience', sa.Text(), nullable=True),
+    sa.Column('education', sa.Text(), nullable=True),
+    sa.Column('certifications', sa.Text(), nullable=True),
+    sa.Column('keywords', sa.Text(), nullable=True),
+    sa.Column('ocr_confidence', sa.Float(), nullable=True),
+    sa.Column('processing_status', sa.String(length=50), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('resumes')
@@ -0,0 +1,26 @@
+"""add resume extraction
+
+Revision ID: f2a7c3d5e914
+Revises: b81f4e6a2d97
+Create Date: 2026-10-17 12:06:33.419862
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a7c3d5e914'
+down_revision = 'b81f4e6a2d97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extraction', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_column('extraction')
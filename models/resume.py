@@ -22,6 +22,9 @@ class Resume(db.Model):
     certifications = db.Column(db.Text, nullable=True)  # JSON string
     keywords = db.Column(db.Text, nullable=True)        # JSON string
     ocr_confidence = db.Column(db.Float, nullable=True)
+    extraction = db.Column(db.Text, nullable=True)      # JSON - detected format and per page text source
+    minhash = db.Column(db.LargeBinary, nullable=True)  # MinHash signature of processed_text
+    duplicate_of = db.Column(db.Integer, db.ForeignKey("resumes.id"), nullable=True, index=True)
     processing_status = db.Column(db.String(50), default="pending")
     error_message = db.Column(db.Text, nullable=True)
     uploaded_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
@@ -49,6 +52,8 @@ class Resume(db.Model):
             "certifications": json.loads(self.certifications) if self.certifications else [],
             "keywords": json.loads(self.keywords) if self.keywords else [],
             "ocr_confidence": self.ocr_confidence,
+            "extraction": json.loads(self.extraction) if self.extraction else None,
+            "duplicate_of": self.duplicate_of,
             "processing_status": self.processing_status,
             "error_message": self.error_message,
             "uploaded_at": self.uploaded_at,
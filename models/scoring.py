@@ -14,6 +14,7 @@ class ScoringResult(db.Model):
     skills_score = db.Column(db.Float, default=0.0)      # 0-100
     experience_score = db.Column(db.Float, default=0.0)  # 0-100
     education_score = db.Column(db.Float, default=0.0)   # 0-100
+    keywords_score = db.Column(db.Float, default=0.0)    # 0-100
 
     # Top reasoning points (JSON array of strings)
     reasoning_points = db.Column(db.Text)  # JSON array - top 3 reasons
@@ -46,6 +47,7 @@ class ScoringResult(db.Model):
             'skills_score': round(self.skills_score, 2),
             'experience_score': round(self.experience_score, 2),
             'education_score': round(self.education_score, 2),
+            'keywords_score': round(self.keywords_score or 0.0, 2),
             'reasoning_points': json.loads(self.reasoning_points) if self.reasoning_points else [],
             'skill_matches': json.loads(self.skill_matches) if self.skill_matches else {},
             'experience_analysis': json.loads(self.experience_analysis) if self.experience_analysis else {},
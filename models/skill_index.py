@@ -0,0 +1,25 @@
+from extensions import db
+
+
+class ResumeTerm(db.Model):
+    '''
+    Persistent inverted index: one row per (resume, field, term).
+    field is one of technical_skills, jd_keywords, education, or
+    experience_years (term holds the number of years, empty if unknown).
+    Ids are never reused (AUTOINCREMENT on SQLite): workers pick up
+    new rows by id.
+    '''
+    __tablename__ = "resume_terms"
+
+    id = db.Column(db.Integer, primary_key=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey("resumes.id"), nullable=False, index=True)
+    field = db.Column(db.String(50), nullable=False)
+    term = db.Column(db.String(255), nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_resume_terms_field_term", "field", "term"),
+        {"sqlite_autoincrement": True},
+    )
+
+    def __repr__(self):
+        return f"<ResumeTerm {self.resume_id} {self.field}={self.term}>"
@@ -0,0 +1,223 @@
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    from .scoring import DEFAULT_WEIGHTS
+except ImportError:  # run as a script from inside nlp/
+    from scoring import DEFAULT_WEIGHTS
+
+
+# ---------- Vocabulary & Encoding ----------
+
+class FeatureVocabulary:
+    """
+    Column layout for the feature matrices: one column per technical
+    skill, JD keyword and degree label seen in the inputs.
+    """
+
+    def __init__(self, skills, keywords, degrees):
+        self.skills = sorted(set(skills))
+        self.keywords = sorted(set(keywords))
+        self.degrees = sorted(set(degrees))
+
+        self.skill_index = {s: i for i, s in enumerate(self.skills)}
+        self.keyword_index = {k: i for i, k in enumerate(self.keywords)}
+        self.degree_index = {d: i for i, d in enumerate(self.degrees)}
+
+    @classmethod
+    def from_features(cls, features_list) -> "FeatureVocabulary":
+        """
+        Build the vocabulary from the terms present in feature dicts.
+        """
+        skills, keywords, degrees = set(), set(), set()
+        for feat in features_list:
+            skills.update(feat["technical_skills"])
+            keywords.update(feat["jd_keywords"])
+            degrees.update(feat["education"])
+        return cls(skills, keywords, degrees)
+
+
+def _encode_sets(values_list, index: Dict[str, int]) -> np.ndarray:
+    """
+    Dense 0/1 matrix (rows = documents, cols = vocabulary terms).
+    float32 so the overlap counts run through BLAS matmul; counts stay
+    exact far beyond any realistic vocabulary size (2**24).
+    """
+    matrix = np.zeros((len(values_list), len(index)), dtype=np.float32)
+    for row, values in enumerate(values_list):
+        cols = [index[v] for v in values if v in index]
+        matrix[row, cols] = 1.0
+    return matrix
+
+
+class FeatureMatrix:
+    """
+    A batch of feature dicts encoded over a FeatureVocabulary.
+    years uses NaN where no experience was found.
+    """
+
+    def __init__(self, features_list, vocab: FeatureVocabulary):
+        self.vocab = vocab
+        self.skills = _encode_sets([f["technical_skills"] for f in features_list], vocab.skill_index)
+        self.keywords = _encode_sets([f["jd_keywords"] for f in features_list], vocab.keyword_index)
+        self.degrees = _encode_sets([f["education"] for f in features_list], vocab.degree_index)
+        self.years = np.array(
+            [np.nan if f["experience_years"] is None else f["experience_years"] for f in features_list],
+            dtype=np.float64,
+        )
+
+    def __len__(self):
+        return len(self.years)
+
+
+def encode_features(features_list, vocab: FeatureVocabulary = None) -> FeatureMatrix:
+    """
+    Encode a list of feature dicts (from extract_features).
+    """
+    features_list = list(features_list)
+    if vocab is None:
+        vocab = FeatureVocabulary.from_features(features_list)
+    return FeatureMatrix(features_list, vocab)
+
+
+# ---------- Rounding ----------
+
+def _round(values: np.ndarray, ndigits: int = 2) -> np.ndarray:
+    """
+    Round exactly like Python's round(x, ndigits).
+    np.round scales by 10**ndigits first, which can disagree with
+    round() when the scaled value lands next to a .5 tie; those few
+    entries are re-rounded in Python.
+    """
+    rounded = np.round(values, ndigits)
+    scaled = values * (10 ** ndigits)
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(float(v), ndigits) for v in values[near_tie]]
+    return rounded
+
+
+# ---------- Component Matrices ----------
+
+def _overlap_percent(resume_terms: np.ndarray, jd_terms: np.ndarray) -> np.ndarray:
+    """
+    (M, N) matrix of |resume & jd| / |jd| * 100, 0 where the JD is empty.
+    Mirrors compute_skill_match / compute_keyword_match.
+    """
+    matched = resume_terms @ jd_terms.T
+    jd_count = jd_terms.sum(axis=1, dtype=np.float64)
+
+    percent = np.zeros(matched.shape, dtype=np.float64)
+    has_jd = jd_count > 0
+    percent[:, has_jd] = matched[:, has_jd].astype(np.float64) / jd_count[has_jd] * 100.0
+    return _round(percent)
+
+
+def skill_match_matrix(resumes: FeatureMatrix, jds: FeatureMatrix) -> np.ndarray:
+    return _overlap_percent(resumes.skills, jds.skills)
+
+
+def keyword_match_matrix(resumes: FeatureMatrix, jds: FeatureMatrix) -> np.ndarray:
+    return _overlap_percent(resumes.keywords, jds.keywords)
+
+
+def experience_match_matrix(resumes: FeatureMatrix, jds: FeatureMatrix) -> np.ndarray:
+    """
+    (M, N) matrix with the same scores as compute_experience_match.
+    """
+    r = resumes.years[:, None]
+    j = jds.years[None, :]
+    r_known = ~np.isnan(r)
+    j_known = ~np.isnan(j)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        partial = _round(np.clip(r / j * 100.0, 0.0, 100.0))
+
+    both = r_known & j_known
+    score = np.zeros(np.broadcast(r, j).shape, dtype=np.float64)
+    score[r_known & ~j_known] = 50.0
+    score[both & (r > 0)] = partial[both & (r > 0)]
+    score[both & (r >= j)] = 100.0
+    return score
+
+
+def education_match_matrix(resumes: FeatureMatrix, jds: FeatureMatrix) -> np.ndarray:
+    """
+    (M, N) matrix with the same scores as compute_education_match.
+    """
+    overlap = (resumes.degrees @ jds.degrees.T) > 0
+    resume_has = resumes.degrees.any(axis=1)[:, None]
+    jd_has = jds.degrees.any(axis=1)[None, :]
+
+    score = np.where(overlap, 100.0, 0.0)
+    score = np.where(~jd_has & resume_has, 50.0, score)
+    return score
+
+
+# ---------- Final Fit Score ----------
+
+def combine_scores(skills, experience, education, keywords, weights=None) -> np.ndarray:
+    """
+    Vectorized calculate_fit_score: same weights (missing ones count
+    as 0), same operation order and same rounding, so every entry equals
+    the scalar result.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    if weights.get("similarity"):
+        raise ValueError("similarity is not one of the combined components")
+
+    final = (
+        skills * weights.get("skills", 0.0) / 100.0 +
+        experience * weights.get("experience", 0.0) / 100.0 +
+        education * weights.get("education", 0.0) / 100.0 +
+        keywords * weights.get("keywords", 0.0) / 100.0
+    ) * 100.0
+
+    return _round(final)
+
+
+# ---------- Re-ranking ----------
+
+# Order of the columns in a component matrix
+COMPONENTS = ("skills", "experience", "education", "keywords")
+
+
+def rerank(ids, components: np.ndarray, weights=None) -> List:
+    """
+    New ranking from stored partial scores, without re-extraction.
+
+    ids: one identifier per row; components: (n, 4) array of skills,
+    experience, education and keyword scores (COMPONENTS order).
+    Returns [(id, job_fit_score)] best first, ties in input order;
+    scores equal calculate_fit_score on the same components.
+    """
+    components = np.asarray(components, dtype=np.float64).reshape(-1, len(COMPONENTS))
+    scores = combine_scores(*components.T, weights=weights)
+    order = np.argsort(-scores, kind="stable")
+    return [(ids[i], float(scores[i])) for i in order]
+
+
+def score_matrix(resume_features: List[Dict], jd_features: List[Dict], weights=None) -> np.ndarray:
+    """
+    Job Fit Score for every resume x JD pair.
+
+    resume_features / jd_features are lists of extract_features() dicts.
+    Returns an (M, N) float64 array where [i, j] equals
+    evaluate_resume_against_jd(resume_i, jd_j)["job_fit_score"].
+    """
+    resume_features = list(resume_features)
+    jd_features = list(jd_features)
+    vocab = FeatureVocabulary.from_features(resume_features + jd_features)
+
+    resumes = encode_features(resume_features, vocab)
+    jds = encode_features(jd_features, vocab)
+
+    return combine_scores(
+        skill_match_matrix(resumes, jds),
+        experience_match_matrix(resumes, jds),
+        education_match_matrix(resumes, jds),
+        keyword_match_matrix(resumes, jds),
+        weights=weights,
+    )
@@ -0,0 +1,106 @@
+import threading
+from typing import Dict, Iterable, List
+
+try:
+    from .feature_extractor import TECH_SKILLS, SOFT_SKILLS, JD_KEYWORDS, DEGREE_PATTERNS
+except ImportError:  # run as a script from inside nlp/
+    from feature_extractor import TECH_SKILLS, SOFT_SKILLS, JD_KEYWORDS, DEGREE_PATTERNS
+
+
+# ---------- Helpers ----------
+
+if hasattr(int, "bit_count"):
+    def popcount(bits: int) -> int:
+        return bits.bit_count()
+else:  # Python < 3.10
+    def popcount(bits: int) -> int:
+        return bin(bits).count("1")
+
+
+# ---------- Vocabulary ----------
+
+class Vocabulary:
+    """
+    Maps terms to bit positions so a set of terms becomes one Python int.
+    Terms missing from the vocabulary are appended on first encode, so
+    the same instance must be used for both sides of a comparison.
+    Appending is locked (the field vocabularies below are shared by all
+    request threads); lookups of known terms are not.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self.terms: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for term in sorted(set(terms)):
+            self.add(term)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def add(self, term: str) -> int:
+        bit = self.index.get(term)
+        if bit is None:
+            with self._lock:
+                bit = self.index.get(term)
+                if bit is None:
+                    bit = len(self.terms)
+                    # terms first: a bit found in index always decodes
+                    self.terms.append(term)
+                    self.index[term] = bit
+        return bit
+
+    def encode(self, terms: Iterable[str]) -> int:
+        bits = 0
+        for term in terms:
+            bit = self.index.get(term)
+            if bit is None:
+                bit = self.add(term)
+            bits |= 1 << bit
+        return bits
+
+    def decode(self, bits: int) -> List[str]:
+        """
+        Sorted list of the terms whose bits are set.
+        """
+        found = []
+        terms = self.terms
+        while bits:
+            low = bits & -bits
+            found.append(terms[low.bit_length() - 1])
+            bits ^= low
+        return sorted(found)
+
+
+# One shared vocabulary per feature field
+SKILL_VOCAB = Vocabulary(TECH_SKILLS)
+SOFT_SKILL_VOCAB = Vocabulary(SOFT_SKILLS)
+KEYWORD_VOCAB = Vocabulary(JD_KEYWORDS)
+DEGREE_VOCAB = Vocabulary(DEGREE_PATTERNS)
+
+FIELD_VOCABS = {
+    "technical_skills": SKILL_VOCAB,
+    "soft_skills": SOFT_SKILL_VOCAB,
+    "jd_keywords": KEYWORD_VOCAB,
+    "education": DEGREE_VOCAB,
+}
+
+
+def encode_feature_bits(features: Dict) -> Dict:
+    """
+    Compact form of an extract_features() dict: every term list becomes
+    an int bitset; experience_years is kept as is. Tokens and clean
+    text are dropped.
+    """
+    bits = {field: vocab.encode(features.get(field) or []) for field, vocab in FIELD_VOCABS.items()}
+    bits["experience_years"] = features.get("experience_years")
+    return bits
+
+
+def decode_feature_bits(bits: Dict) -> Dict:
+    """
+    Inverse of encode_feature_bits (without tokens / clean text).
+    """
+    features = {field: vocab.decode(bits[field]) for field, vocab in FIELD_VOCABS.items()}
+    features["experience_years"] = bits.get("experience_years")
+    return features
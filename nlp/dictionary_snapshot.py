@@ -0,0 +1,167 @@
+"""
+Precompiled dictionary snapshot.
+
+Parsing the data/*.txt dictionaries and building the phrase automaton
+is paid once by a build step instead of at every import. The snapshot
+is a pickle of plain data (lists / dicts) plus a checksum of the
+source files. Importing never writes it: without a current snapshot
+(missing, or a source file changed since) the dictionaries are compiled
+in memory until the snapshot is rebuilt.
+
+Build (or force a rebuild) from the project root:
+
+    python -m nlp.dictionary_snapshot [--force]
+"""
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+
+try:
+    from .phrase_matcher import PhraseMatcher, build_matcher
+    from .fuzzy_skills import FuzzySkillIndex
+except ImportError:  # run as a script from inside nlp/
+    from phrase_matcher import PhraseMatcher, build_matcher
+    from fuzzy_skills import FuzzySkillIndex
+
+
+# ---------- Paths & Helpers ----------
+
+# This finds your project root (resume-job-fit-scorer/)
+BASE_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = BASE_DIR / "data"
+
+# Bump when the snapshot layout or the build logic changes
+SNAPSHOT_FORMAT = 2
+
+SNAPSHOT_PATH = Path(os.getenv("DICTIONARY_SNAPSHOT_PATH", DATA_DIR / "dictionaries.snapshot.pkl"))
+
+SOURCE_FILES = {
+    "technical": "technical_skills.txt",
+    "soft": "soft_skills.txt",
+    "jd_keyword": "jd_keywords.txt",
+}
+
+
+def load_list(filepath: Path) -> list:
+    """
+    Load a text file where each line is one item.
+    Returns a list of lowercase strings.
+    """
+    items = []
+    try:
+        with filepath.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    items.append(line.lower())
+    except FileNotFoundError:
+        print(f"[WARN] File not found: {filepath}")
+    return items
+
+
+def source_checksum(data_dir: Path = DATA_DIR) -> str:
+    """
+    SHA-256 over the names and bytes of the dictionary files.
+    """
+    digest = hashlib.sha256(f"format:{SNAPSHOT_FORMAT}".encode())
+    for label, name in sorted(SOURCE_FILES.items()):
+        digest.update(f"\0{label}\0".encode())
+        try:
+            digest.update((data_dir / name).read_bytes())
+        except FileNotFoundError:
+            digest.update(b"\0missing")
+    return digest.hexdigest()
+
+
+# ---------- Build / Load ----------
+
+def build_snapshot(data_dir: Path = DATA_DIR, checksum: str = None) -> dict:
+    """
+    Parse the dictionaries, compile the matcher and the typo-tolerant
+    technical skill index.
+    """
+    lists = {label: load_list(data_dir / name) for label, name in SOURCE_FILES.items()}
+    matcher = build_matcher(lists)
+    fuzzy = FuzzySkillIndex(lists["technical"])
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "checksum": checksum or source_checksum(data_dir),
+        "lists": lists,
+        "matcher": matcher.to_state(),
+        "fuzzy": fuzzy.to_state(),
+    }
+
+
+def write_snapshot(snapshot: dict, path: Path = SNAPSHOT_PATH) -> bool:
+    tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"[WARN] Could not write dictionary snapshot {path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def read_snapshot(path: Path = SNAPSHOT_PATH):
+    try:
+        with path.open("rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+        return None
+
+
+def is_current(snapshot, checksum: str) -> bool:
+    return (isinstance(snapshot, dict)
+            and snapshot.get("format") == SNAPSHOT_FORMAT
+            and snapshot.get("checksum") == checksum)
+
+
+def load_dictionaries(data_dir: Path = DATA_DIR, path: Path = SNAPSHOT_PATH, refresh: bool = False) -> dict:
+    """
+    Return {"checksum", "lists", "matcher", "fuzzy"} for the current dictionary
+    files: from the snapshot when its checksum matches, otherwise built
+    from the text files. refresh: also write the built snapshot to path.
+    """
+    checksum = source_checksum(data_dir)
+
+    snapshot = read_snapshot(path)
+    if not is_current(snapshot, checksum):
+        snapshot = build_snapshot(data_dir, checksum)
+        if refresh:
+            write_snapshot(snapshot, path)
+
+    return {
+        "checksum": snapshot["checksum"],
+        "lists": snapshot["lists"],
+        "matcher": PhraseMatcher.from_state(snapshot["matcher"]),
+        "fuzzy": FuzzySkillIndex.from_state(snapshot["fuzzy"]),
+    }
+
+
+# ---------- CLI ----------
+
+def main():
+    force = "--force" in sys.argv[1:]
+    checksum = source_checksum(DATA_DIR)
+    snapshot = None if force else read_snapshot(SNAPSHOT_PATH)
+
+    if is_current(snapshot, checksum):
+        print(f"Snapshot up to date: {SNAPSHOT_PATH}")
+        return
+
+    snapshot = build_snapshot(DATA_DIR, checksum)
+    if write_snapshot(snapshot, SNAPSHOT_PATH):
+        sizes = ", ".join(f"{label}={len(items)}" for label, items in snapshot["lists"].items())
+        print(f"Wrote {SNAPSHOT_PATH} ({sizes}, checksum {checksum[:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Latent semantic (LSA) resume embeddings and a CPU-only ANN index.
+
+- LSAModel: TF-IDF followed by truncated SVD, fitted offline on our
+  own resumes. Stored as plain arrays (vocabulary, IDF, SVD
+  components), so loading it needs neither pickle nor scikit-learn.
+- Vectors: one L2-normalized float32 row per resume in a memory-mapped
+  file; only the rows a query touches are paged in.
+- IVFIndex: k-means centroids over the vectors (inverted file). Rows
+  are stored grouped by centroid, so probing a list reads one
+  contiguous slice of the memmap.
+
+Build offline (see build_embedding_index), then query with
+EmbeddingIndex.load(path).search(text, k). Each build goes to a new
+version directory under path and is published by rewriting the CURRENT
+pointer, so readers never see a half-written index.
+"""
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+try:
+    from .preprocess import preprocess
+except ImportError:  # run as a script from inside nlp/
+    from preprocess import preprocess
+
+
+# ---------- Parameters ----------
+
+EMBEDDING_DIMS = 128
+MAX_FEATURES = 50000
+MIN_DF = 2
+
+# Training sample and iterations for the k-means coarse quantizer
+IVF_TRAIN_SAMPLE = 50000
+IVF_ITERATIONS = 15
+IVF_NPROBE = 8
+
+ENCODE_BATCH = 1000
+
+# File naming the live version directory of an index
+CURRENT_POINTER = "CURRENT"
+
+
+def _tokens(text: str) -> List[str]:
+    return preprocess(text or "")["tokens"]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# ---------- LSA Model ----------
+
+class LSAModel:
+    """
+    TF-IDF (sublinear tf, l2 norm) + truncated SVD.
+    """
+
+    def __init__(self, vocabulary: dict, idf: np.ndarray, components: np.ndarray):
+        self.vocabulary = vocabulary
+        self.idf = idf.astype(np.float32)
+        self.components = components.astype(np.float32)     # dims x terms
+
+    @property
+    def dims(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(cls, texts: Sequence[str], dims: int = EMBEDDING_DIMS, seed: int = 0) -> "LSAModel":
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(
+            tokenizer=_tokens, lowercase=False, token_pattern=None,
+            sublinear_tf=True, min_df=MIN_DF, max_features=MAX_FEATURES,
+        )
+        tfidf = vectorizer.fit_transform(texts)
+        dims = max(1, min(dims, tfidf.shape[1] - 1, tfidf.shape[0] - 1))
+        svd = TruncatedSVD(n_components=dims, random_state=seed).fit(tfidf)
+
+        vocabulary = {term: int(col) for term, col in vectorizer.vocabulary_.items()}
+        return cls(vocabulary, vectorizer.idf_, svd.components_)
+
+    def _tfidf(self, texts: Iterable[str]) -> sparse.csr_matrix:
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = {}
+            for token in _tokens(text):
+                col = self.vocabulary.get(token)
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+            indices.extend(counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int64), indptr),
+            shape=(len(indptr) - 1, len(self.vocabulary)),
+        )
+        matrix.data = (1.0 + np.log(matrix.data)).astype(np.float32)
+        matrix = matrix.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        L2-normalized float32 embeddings, one row per text.
+        """
+        dense = self._tfidf(texts) @ self.components.T
+        return _normalize_rows(np.asarray(dense, dtype=np.float32)).astype(np.float32)
+
+    def save(self, directory: Path):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        (directory / "lsa_vocabulary.json").write_text(json.dumps(terms), encoding="utf-8")
+        np.save(directory / "lsa_idf.npy", self.idf)
+        np.save(directory / "lsa_components.npy", self.components)
+
+    @classmethod
+    def load(cls, directory: Path) -> "LSAModel":
+        directory = Path(directory)
+        terms = json.loads((directory / "lsa_vocabulary.json").read_text(encoding="utf-8"))
+        return cls(
+            {term: col for col, term in enumerate(terms)},
+            np.load(directory / "lsa_idf.npy"),
+            np.load(directory / "lsa_components.npy"),
+        )
+
+
+# ---------- Index Versions ----------
+
+def resolve_index_dir(directory: Path) -> Path:
+    """
+    Directory holding the live index: the version named by CURRENT, or
+    directory itself for indexes built before versioning.
+    """
+    directory = Path(directory)
+    try:
+        version = (directory / CURRENT_POINTER).read_text(encoding="utf-8").strip()
+    except OSError:
+        return directory
+    return directory / version
+
+
+def _publish_version(directory: Path, version: str):
+    """
+    Point CURRENT at a complete version directory (atomic rename), then
+    drop versions older than the one it replaces; that one is kept for
+    readers still holding its memmap.
+    """
+    previous = resolve_index_dir(directory).name
+    pointer_tmp = directory / f"{CURRENT_POINTER}.{os.getpid()}.tmp"
+    pointer_tmp.write_text(version, encoding="utf-8")
+    os.replace(pointer_tmp, directory / CURRENT_POINTER)
+
+    for path in directory.glob("v*"):
+        if path.is_dir() and path.name not in (version, previous):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# ---------- IVF Index ----------
+
+def train_centroids(vectors: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means (cosine) on a sample of the vectors.
+    """
+    rng = np.random.RandomState(seed)
+    n = vectors.shape[0]
+    sample = np.sort(rng.choice(n, size=min(n, IVF_TRAIN_SAMPLE), replace=False))
+    data = np.asarray(vectors[sample], dtype=np.float32)
+
+    nlist = max(1, min(nlist, len(data)))
+    centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+    for _ in range(IVF_ITERATIONS):
+        assign = (data @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        empty = np.bincount(assign, minlength=nlist) == 0
+        # Re-seed empty lists with random points
+        sums[empty] = data[rng.choice(len(data), size=int(empty.sum()))]
+        centroids = _normalize_rows(sums).astype(np.float32)
+    return centroids
+
+
+def assign_lists(vectors: np.ndarray, centroids: np.ndarray, batch: int = 65536) -> np.ndarray:
+    assign = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], batch):
+        block = np.asarray(vectors[start:start + batch], dtype=np.float32)
+        assign[start:start + batch] = (block @ centroids.T).argmax(axis=1)
+    return assign
+
+
+class EmbeddingIndex:
+    """
+    Memory-mapped vectors grouped by IVF list, plus the LSA model used
+    to embed queries. search() scores only the nprobe closest lists.
+    """
+
+    def __init__(self, model: LSAModel, vectors: np.ndarray, ids: np.ndarray,
+                 centroids: np.ndarray, offsets: np.ndarray):
+        self.model = model
+        self.vectors = vectors          # (n, dims) float32, rows grouped by list
+        self.ids = ids                  # row -> resume id
+        self.centroids = centroids      # (nlist, dims)
+        self.offsets = offsets          # list i = rows offsets[i]:offsets[i + 1]
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, directory: Path) -> "EmbeddingIndex":
+        directory = resolve_index_dir(directory)
+        meta = json.loads((directory / "index.json").read_text(encoding="utf-8"))
+        vectors = np.memmap(directory / "vectors.f32", dtype=np.float32, mode="r",
+                            shape=(meta["count"], meta["dims"]))
+        return cls(
+            LSAModel.load(directory),
+            vectors,
+            np.load(directory / "ids.npy"),
+            np.load(directory / "centroids.npy"),
+            np.load(directory / "offsets.npy"),
+        )
+
+    def search_vector(self, query: np.ndarray, k: int = 10, nprobe: int = IVF_NPROBE) -> List[Tuple[int, float]]:
+        """
+        [(resume_id, cosine similarity)] of the k nearest vectors found
+        in the nprobe closest lists, best first. Empty for a zero query
+        (e.g. text with no known terms): every resume would tie at 0.
+        """
+        if k <= 0 or len(self.ids) == 0 or not np.any(query):
+            return []
+        nprobe = max(1, min(nprobe, len(self.centroids)))
+        lists = np.argsort(-(self.centroids @ query))[:nprobe]
+
+        best_rows, best_scores = [], []
+        for lst in lists:
+            start, end = int(self.offsets[lst]), int(self.offsets[lst + 1])
+            if start == end:
+                continue
+            scores = np.asarray(self.vectors[start:end]) @ query
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(scores))
+            best_rows.append(top + start)
+            best_scores.append(scores[top])
+
+        if not best_rows:
+            return []
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+        order = np.lexsort((self.ids[rows], -scores))[:k]
+        return [(int(self.ids[rows[i]]), round(float(scores[i]), 4)) for i in order]
+
+    def search(self, text: str, k: int = 10, nprobe: int = IVF_NPROBE) -> List[Tuple[int, float]]:
+        return self.search_vector(self.model.encode([text])[0], k, nprobe)
+
+
+# ---------- Offline Build ----------
+
+def build_embedding_index(docs: Iterable[Tuple[int, str]], directory: Path,
+                          dims: int = EMBEDDING_DIMS, nlist: int = None,
+                          train_texts: Sequence[str] = None) -> EmbeddingIndex:
+    """
+    Fit the LSA model, embed every (resume_id, text) in batches into a
+    float32 file, train the IVF centroids and write the index to
+    directory. nlist defaults to ~sqrt(number of resumes).
+
+    train_texts: texts to fit the LSA model on. Defaults to all texts,
+    which keeps them all in memory; for very large pools pass a sample
+    and docs as a generator, which is then only streamed once.
+
+    The index is written to a staging directory (index.json last),
+    renamed to a new version directory and only then made current, so
+    the index being served is never modified.
+    """
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    version = f"v{time.time_ns()}"
+    staging = root / f".{version}.tmp"
+    staging.mkdir()
+    try:
+        _write_index(docs, staging, dims, nlist, train_texts)
+        os.replace(staging, root / version)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    _publish_version(root, version)
+    return EmbeddingIndex.load(root)
+
+
+def _write_index(docs, directory: Path, dims, nlist, train_texts):
+    if train_texts is None:
+        docs = list(docs)
+        train_texts = [text for _, text in docs]
+    model = LSAModel.fit(train_texts, dims)
+    model.save(directory)
+
+    # Embed into a scratch file, then write rows grouped by list
+    scratch_path = directory / "vectors.tmp"
+    ids = []
+    batch = []
+    with scratch_path.open("wb") as f:
+        for doc in docs:
+            batch.append(doc)
+            if len(batch) == ENCODE_BATCH:
+                f.write(model.encode([text for _, text in batch]).tobytes())
+                ids.extend(doc_id for doc_id, _ in batch)
+                batch = []
+        if batch:
+            f.write(model.encode([text for _, text in batch]).tobytes())
+            ids.extend(doc_id for doc_id, _ in batch)
+
+    if not ids:
+        scratch_path.unlink()
+        raise ValueError("No documents to index")
+
+    ids = np.array(ids, dtype=np.int64)
+    count = len(ids)
+    scratch = np.memmap(scratch_path, dtype=np.float32, mode="r", shape=(count, model.dims))
+
+    centroids = train_centroids(scratch, nlist or max(1, int(np.sqrt(count))))
+    assign = assign_lists(scratch, centroids)
+    order = np.argsort(assign, kind="stable")
+    offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(assign, minlength=len(centroids)))
+
+    vectors = np.memmap(directory / "vectors.f32", dtype=np.float32, mode="w+", shape=(count, model.dims))
+    for start in range(0, count, 65536):
+        rows = order[start:start + 65536]
+        vectors[start:start + len(rows)] = scratch[rows]
+    vectors.flush()
+    del vectors, scratch
+    scratch_path.unlink()
+
+    np.save(directory / "ids.npy", ids[order])
+    np.save(directory / "centroids.npy", centroids)
+    np.save(directory / "offsets.npy", offsets)
+    # Written last: a directory with index.json holds a complete index
+    (directory / "index.json").write_text(json.dumps({
+        "count": count, "dims": model.dims, "nlist": len(centroids),
+    }), encoding="utf-8")
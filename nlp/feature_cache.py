@@ -0,0 +1,221 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+# Disk eviction trims the tier to this share of max_disk_bytes, so it
+# does not run again on the very next write
+DISK_EVICT_TO = 0.9
+
+
+# ---------- Content-hash LRU cache ----------
+
+def normalize_for_key(text: str) -> str:
+    """
+    Normalization applied before hashing: line endings and surrounding
+    whitespace never change what the extractors find.
+    """
+    return (text or "").replace("\r\n", "\n").strip()
+
+
+class FeatureCache:
+    """
+    Bounded LRU cache keyed by SHA-256 of (version, normalized text).
+
+    - max_size: entries kept in memory; least recently used is evicted.
+    - disk_dir: optional second tier; entries are pickled under
+      disk_dir/<version>/ and survive restarts / are shared by workers.
+    - max_disk_bytes: size bound of the disk tier (0 = unbounded); the
+      least recently used files (by mtime, refreshed on hits) are
+      evicted.
+    - version: anything the cached values depend on besides the text
+      (e.g. a checksum of the dictionaries); changing it invalidates
+      every entry.
+
+    Cached values are shared between callers: treat them as read-only.
+    """
+
+    def __init__(self, max_size: int = 256, disk_dir=None, version: str = "",
+                 max_disk_bytes: int = 0):
+        self.max_size = max(0, int(max_size))
+        self.max_disk_bytes = max(0, int(max_disk_bytes))
+        self.version = version
+        self.disk_dir = None
+        if disk_dir:
+            self.disk_dir = os.path.join(disk_dir, hashlib.sha256(version.encode()).hexdigest()[:16])
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._disk_bytes = None         # scanned on first disk write
+
+    def key(self, text: str, variant: str = "") -> str:
+        """
+        variant: extraction options that change the value for the same
+        text (e.g. "segmented"); "" for the default.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.version.encode("utf-8"))
+        digest.update(b"\0")
+        if variant:
+            digest.update(variant.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(normalize_for_key(text).encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    # ---------- Disk tier ----------
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key + ".pkl")
+
+    def _disk_get(self, key: str):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)  # mark as recently used
+            return value
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+
+    def _disk_put(self, key: str, value):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARN] Could not write feature cache entry: {e}")
+            return
+
+        if not self.max_disk_bytes:
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+            else:
+                self._disk_bytes += size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._disk_evict()
+
+    def _disk_entries(self):
+        """
+        [(mtime, size, path)] of every file in the disk tier.
+        """
+        entries = []
+        try:
+            buckets = list(os.scandir(self.disk_dir))
+        except OSError:
+            return entries
+        for bucket in buckets:
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.name.endswith(".pkl"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _disk_evict(self):
+        """
+        Remove least recently used files until the disk tier is back under
+        DISK_EVICT_TO * max_disk_bytes. Scans the directory, so files
+        written by other workers are counted too.
+        """
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * DISK_EVICT_TO
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.disk_evictions += 1
+        self._disk_bytes = total
+
+    # ---------- Memory tier ----------
+
+    def _remember(self, key: str, value):
+        if self.max_size == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str):
+        """
+        Cached value for a key, or None.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._remember(key, value)
+        self._disk_put(key, value)
+
+    def get_or_compute(self, text: str, compute, variant: str = ""):
+        """
+        Return the cached value for text, computing compute(text) on a miss.
+        """
+        key = self.key(text, variant)
+        value = self.get(key)
+        if value is None:
+            value = compute(text)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """
+        Drop the in-memory entries and reset the counters (disk kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+            self.disk_evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
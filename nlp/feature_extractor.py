@@ -1,37 +1,31 @@
+import hashlib
+import json
+import os
 import re
-from pathlib import Path
+from collections.abc import Mapping
 
-from preprocess import preprocess  # using your Step 3 code
+try:
+    from .preprocess import preprocess, normalize_words, iter_text_chunks, STOPWORDS, STREAM_CHUNK_SIZE
+    from .feature_cache import FeatureCache
+    from .dictionary_snapshot import BASE_DIR, DATA_DIR, load_list, load_dictionaries
+    from .sections import segment_sections
+except ImportError:  # run as a script from inside nlp/
+    from preprocess import preprocess  # using your Step 3 code
+    from preprocess import normalize_words, iter_text_chunks, STOPWORDS, STREAM_CHUNK_SIZE
+    from feature_cache import FeatureCache
+    from dictionary_snapshot import BASE_DIR, DATA_DIR, load_list, load_dictionaries
+    from sections import segment_sections
 
 
-# ---------- Paths & Helpers ----------
+# ---------- Dictionaries ----------
 
-# This finds your project root (resume-job-fit-scorer/)
-BASE_DIR = Path(__file__).resolve().parents[2]
-DATA_DIR = BASE_DIR / "data"
+# Load dictionaries from Step 2 files, through the compiled snapshot
+# (see dictionary_snapshot.py); rebuilt only when a file changed.
+_DICTIONARIES = load_dictionaries()
 
-
-def load_list(filepath: Path) -> list:
-    """
-    Load a text file where each line is one item.
-    Returns a list of lowercase strings.
-    """
-    items = []
-    try:
-        with filepath.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    items.append(line.lower())
-    except FileNotFoundError:
-        print(f"[WARN] File not found: {filepath}")
-    return items
-
-
-# Load dictionaries from Step 2 files
-TECH_SKILLS = load_list(DATA_DIR / "technical_skills.txt")
-SOFT_SKILLS = load_list(DATA_DIR / "soft_skills.txt")
-JD_KEYWORDS = load_list(DATA_DIR / "jd_keywords.txt")
+TECH_SKILLS = _DICTIONARIES["lists"]["technical"]
+SOFT_SKILLS = _DICTIONARIES["lists"]["soft"]
+JD_KEYWORDS = _DICTIONARIES["lists"]["jd_keyword"]
 
 
 # Split skills into single-word and multi-word for better matching
@@ -42,13 +36,129 @@ SOFT_SINGLE = {s for s in SOFT_SKILLS if " " not in s}
 SOFT_MULTI = {s for s in SOFT_SKILLS if " " in s}
 
 
+# Degree label -> aliases searched for in the raw text
+DEGREE_PATTERNS = {
+    "b.tech": ["b.tech", "btech", "bachelor of technology"],
+    "b.e": ["b.e", "be", "bachelor of engineering"],
+    "b.sc": ["b.sc", "bsc", "bachelor of science"],
+    "bca": ["bca", "bachelor of computer applications"],
+    "m.tech": ["m.tech", "mtech", "master of technology"],
+    "m.sc": ["m.sc", "msc", "master of science"],
+    "mca": ["mca", "master of computer applications"],
+    "phd": ["phd", "doctor of philosophy"],
+}
+
+# Aliases that are also ordinary English words: only matched when
+# written in capitals ("BE", not "will be").
+CASE_SENSITIVE_ALIASES = {"be"}
+
+
+def _alias_regex(alias: str) -> str:
+    if alias in CASE_SENSITIVE_ALIASES:
+        return "(?-i:" + re.escape(alias.upper()) + ")"
+    return r"\s+".join(re.escape(word) for word in alias.split())
+
+
+def _build_edu_exp_regex():
+    """
+    One case-insensitive pattern for experience mentions and degree
+    aliases. Degree aliases must stand alone as words, so "be" no longer
+    matches inside "become" and "bsc" not inside "absconded".
+    """
+    alias_label = {}
+    for label, aliases in DEGREE_PATTERNS.items():
+        for alias in aliases:
+            alias_label[alias] = label
+
+    # Longest first so the full alias wins over a shorter prefix
+    aliases = sorted(alias_label, key=len, reverse=True)
+    groups = []
+    group_label = {}
+    for i, alias in enumerate(aliases):
+        name = f"d{i}"
+        groups.append(f"(?P<{name}>{_alias_regex(alias)})")
+        group_label[name] = alias_label[alias]
+
+    pattern = (
+        r"(?P<years>\d+)\s*\+?\s*(?:years?|yrs?)(?!\w)"
+        r"|(?<!\w)(?:" + "|".join(groups) + r")(?!\w)"
+    )
+    return re.compile(pattern, re.IGNORECASE), group_label
+
+
+EDU_EXP_RE, _DEGREE_GROUP_LABEL = _build_edu_exp_regex()
+
+
+# Resume sections (see sections.py) each scan is restricted to when
+# segmenting: "5 years" or "M.Tech" inside a project description or a
+# degree's duration say nothing about the candidate. "other" holds the
+# summary and any text before the first heading, so an unsegmented
+# resume is still scanned whole.
+EXPERIENCE_SECTIONS = ("experience", "skills", "other")
+EDUCATION_SECTIONS = ("education", "other")
+
+
+# One automaton over all dictionaries: a single pass over the tokens
+# finds every technical skill, soft skill and JD keyword at once.
+MATCHER = _DICTIONARIES["matcher"]
+
+# Typo-tolerant technical skill lookup ("Pyhton", "Kubernets",
+# "Postgre SQL"); only used when fuzzy matching is requested.
+FUZZY_SKILLS = _DICTIONARIES["fuzzy"]
+
+# Default for extract_resume_features(fuzzy=None)
+FUZZY_SKILL_MATCHING = os.getenv("FUZZY_SKILL_MATCHING", "0").lower() in ("1", "true", "yes")
+
+
+# ---------- Caching ----------
+
+# Bump when a change to the extraction code changes its output
+EXTRACTOR_VERSION = "2"
+
+# Changes whenever a dictionary file (or the extractor) changes, so
+# cached features from older dictionaries are never returned.
+DICTIONARY_VERSION = hashlib.sha256(json.dumps(
+    [EXTRACTOR_VERSION, _DICTIONARIES["checksum"], DEGREE_PATTERNS]
+).encode("utf-8")).hexdigest()
+
+_CACHE_DIR = os.getenv("FEATURE_CACHE_DIR") or None
+# Size bound of each cache's disk tier
+_CACHE_MAX_BYTES = int(os.getenv("FEATURE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+FEATURE_CACHE = FeatureCache(
+    max_size=int(os.getenv("FEATURE_CACHE_SIZE", 256)),
+    disk_dir=_CACHE_DIR,
+    version="features:" + DICTIONARY_VERSION,
+    max_disk_bytes=_CACHE_MAX_BYTES,
+)
+
+PREPROCESS_CACHE = FeatureCache(
+    max_size=int(os.getenv("PREPROCESS_CACHE_SIZE", 256)),
+    disk_dir=_CACHE_DIR,
+    version="preprocess:" + EXTRACTOR_VERSION,
+    max_disk_bytes=_CACHE_MAX_BYTES,
+)
+
+
+def cache_stats() -> dict:
+    """
+    Hit / miss counters of the extraction caches.
+    """
+    return {
+        "features": FEATURE_CACHE.stats(),
+        "preprocess": PREPROCESS_CACHE.stats(),
+    }
+
+
 # ---------- Extraction Functions ----------
 
 def extract_skills(tokens: list, clean_text: str, single_set: set, multi_set: set) -> set:
     """
-    Generic skill extractor:
+    Generic skill extractor for ad-hoc skill sets:
     - For single-word skills: match against tokens.
     - For multi-word skills: match against the cleaned text (string).
+
+    The built-in dictionaries go through MATCHER instead (see below).
     """
     token_set = set(tokens)
 
@@ -67,23 +177,81 @@ def extract_skills(tokens: list, clean_text: str, single_set: set, multi_set: se
     return found
 
 
+def extract_dictionary_terms(tokens: list) -> dict:
+    """
+    One linear pass over the tokens with the compiled automaton.
+    Returns {"technical": set, "soft": set, "jd_keyword": set}.
+    Phrases only match on whole tokens ("rest api" does not match
+    inside "interest apis").
+    """
+    found = MATCHER.find(tokens)
+    return {
+        "technical": found.get("technical", set()),
+        "soft": found.get("soft", set()),
+        "jd_keyword": found.get("jd_keyword", set()),
+    }
+
+
 def extract_technical_skills(tokens: list, clean_text: str) -> set:
-    return extract_skills(tokens, clean_text, TECH_SINGLE, TECH_MULTI)
+    return extract_dictionary_terms(tokens)["technical"]
 
 
 def extract_soft_skills(tokens: list, clean_text: str) -> set:
-    return extract_skills(tokens, clean_text, SOFT_SINGLE, SOFT_MULTI)
+    return extract_dictionary_terms(tokens)["soft"]
 
 
 def extract_jd_keywords(clean_text: str) -> set:
     """
     Extract JD-related keywords that appear in clean_text.
     """
-    found = set()
-    for kw in JD_KEYWORDS:
-        if kw in clean_text:
-            found.add(kw)
-    return found
+    return extract_dictionary_terms(clean_text.split())["jd_keyword"]
+
+
+def extract_experience_and_education(raw_text: str) -> tuple:
+    """
+    Single pass over the original (un-cleaned) text with EDU_EXP_RE.
+    Returns (experience_years, degrees):
+    - experience_years: the maximum of mentions like 2 years, 3+ years,
+      5 yrs (most experience mentioned), or None if nothing.
+    - degrees: set of degree labels detected.
+    """
+    years = None
+    degrees = set()
+
+    for match in EDU_EXP_RE.finditer(raw_text or ""):
+        if match.group("years") is not None:
+            value = int(match.group("years"))
+            if years is None or value > years:
+                years = value
+        else:
+            degrees.add(_DEGREE_GROUP_LABEL[match.lastgroup])
+
+    return years, degrees
+
+
+def extract_experience_and_education_sections(raw_text: str) -> tuple:
+    """
+    Same result shape as extract_experience_and_education(), but years
+    are only read from EXPERIENCE_SECTIONS and degrees only from
+    EDUCATION_SECTIONS. Each section is scanned at most once; sections
+    relevant to neither (projects) are skipped.
+    """
+    years = None
+    degrees = set()
+
+    for name, text in segment_sections(raw_text).items():
+        want_years = name in EXPERIENCE_SECTIONS
+        want_degrees = name in EDUCATION_SECTIONS
+        if not (want_years or want_degrees):
+            continue
+
+        section_years, section_degrees = extract_experience_and_education(text)
+        if want_years and section_years is not None and (years is None or section_years > years):
+            years = section_years
+        if want_degrees:
+            degrees |= section_degrees
+
+    return years, degrees
 
 
 def extract_experience_years(raw_text: str):
@@ -93,16 +261,7 @@ def extract_experience_years(raw_text: str):
         2 years, 3+ years, 5 yrs, etc.
     Returns the maximum number found, or None if nothing.
     """
-    text = raw_text.lower()
-    pattern = r"(\d+)\s*\+?\s*(?:years?|yrs?)"
-    matches = re.findall(pattern, text)
-
-    if not matches:
-        return None
-
-    # Convert all matches to int and return the maximum (most experience mentioned)
-    years = [int(m) for m in matches]
-    return max(years) if years else None
+    return extract_experience_and_education(raw_text)[0]
 
 
 def extract_education(raw_text: str) -> set:
@@ -110,54 +269,184 @@ def extract_education(raw_text: str) -> set:
     Look for common degree names in the raw text.
     Returns a set of degrees detected.
     """
-    text = raw_text.lower()
-    degrees = {
-        "b.tech": ["b.tech", "btech", "bachelor of technology"],
-        "b.e": ["b.e", "be", "bachelor of engineering"],
-        "b.sc": ["b.sc", "bsc", "bachelor of science"],
-        "bca": ["bca", "bachelor of computer applications"],
-        "m.tech": ["m.tech", "mtech", "master of technology"],
-        "m.sc": ["m.sc", "msc", "master of science"],
-        "mca": ["mca", "master of computer applications"],
-        "bca": ["bca", "bachelor of computer applications"],
-        "phd": ["phd", "doctor of philosophy"]
+    return extract_experience_and_education(raw_text)[1]
+
+
+# ---------- Feature Pipeline ----------
+
+def _stage_preprocess(features) -> dict:
+    # Use your existing preprocessing (memoized by content hash)
+    pre = PREPROCESS_CACHE.get_or_compute(features.raw_text, preprocess)
+    return {
+        "clean_text": pre["clean_text"],
+        "tokens": pre["tokens"],
     }
 
-    found_degrees = set()
 
-    for label, patterns in degrees.items():
-        for p in patterns:
-            if p in text:
-                found_degrees.add(label)
-                break
+def _stage_dictionary(features) -> dict:
+    terms = extract_dictionary_terms(features["tokens"])
+    if features.fuzzy:
+        terms["technical"] = terms["technical"] | FUZZY_SKILLS.find(features["tokens"])
+    return {
+        "technical_skills": sorted(terms["technical"]),
+        "soft_skills": sorted(terms["soft"]),
+        "jd_keywords": sorted(terms["jd_keyword"]),
+    }
 
-    return found_degrees
+
+def _stage_experience_education(features) -> dict:
+    if features.segment:
+        years, degrees = extract_experience_and_education_sections(features.raw_text)
+    else:
+        years, degrees = extract_experience_and_education(features.raw_text)
+    return {
+        "experience_years": years,
+        "education": sorted(degrees),
+    }
+
+
+# field -> stage that produces it (a stage may produce several fields)
+FEATURE_STAGES = {
+    "clean_text": _stage_preprocess,
+    "tokens": _stage_preprocess,
+    "technical_skills": _stage_dictionary,
+    "soft_skills": _stage_dictionary,
+    "jd_keywords": _stage_dictionary,
+    "experience_years": _stage_experience_education,
+    "education": _stage_experience_education,
+}
+
+FEATURE_FIELDS = tuple(FEATURE_STAGES)
 
 
-def extract_features(raw_text: str) -> dict:
+class LazyFeatures(Mapping):
+    """
+    Read-only feature mapping that runs each extraction stage on first
+    access to one of its fields. Asking only for "experience_years"
+    never tokenizes the text; asking for skills runs preprocessing and
+    the dictionary matcher but not the experience/education scans.
+
+    segment: restrict the experience / education scans to their resume
+    sections (see EXPERIENCE_SECTIONS). Skills and keywords are still
+    matched over the whole text.
+
+    fuzzy: also accept technical skills within a small edit distance of
+    a token or of two adjacent tokens (see fuzzy_skills.py).
+    """
+
+    def __init__(self, raw_text: str, segment: bool = False, fuzzy: bool = False):
+        self.raw_text = raw_text
+        self.segment = segment
+        self.fuzzy = fuzzy
+        self._values = {}
+
+    def __getitem__(self, field):
+        if field not in self._values:
+            stage = FEATURE_STAGES.get(field)
+            if stage is None:
+                raise KeyError(field)
+            self._values.update(stage(self))
+        return self._values[field]
+
+    def __iter__(self):
+        return iter(FEATURE_FIELDS)
+
+    def __len__(self):
+        return len(FEATURE_FIELDS)
+
+    def computed_fields(self) -> list:
+        return [f for f in FEATURE_FIELDS if f in self._values]
+
+    def to_dict(self) -> dict:
+        return {field: self[field] for field in FEATURE_FIELDS}
+
+    def __repr__(self):
+        return f"<LazyFeatures computed={self.computed_fields()}>"
+
+
+def _cache_variant(segment: bool, fuzzy: bool) -> str:
+    return ",".join(name for name, on in (("segmented", segment), ("fuzzy", fuzzy)) if on)
+
+
+def extract_features(raw_text: str, fields=None, segment: bool = False, fuzzy: bool = False):
     """
     Main function: given raw resume or JD text,
     returns a dictionary of extracted features.
+
+    fields: optional iterable of the feature names the caller needs
+    (see FEATURE_FIELDS). Only the stages producing them run now, and
+    a LazyFeatures mapping is returned that computes any other field on
+    first access. Without fields, everything is computed and a plain
+    dict is returned; that full result is memoized in FEATURE_CACHE, so
+    extracting the same text again is a lookup (with or without fields).
+
+    segment / fuzzy: see LazyFeatures (segment is used for resumes,
+    not for JDs).
+    """
+    if fields is None:
+        cached = FEATURE_CACHE.get_or_compute(
+            raw_text,
+            lambda text: LazyFeatures(text, segment, fuzzy).to_dict(),
+            variant=_cache_variant(segment, fuzzy),
+        )
+        return dict(cached)
+
+    # A full result computed earlier covers any subset of fields
+    cached = FEATURE_CACHE.get(FEATURE_CACHE.key(raw_text, _cache_variant(segment, fuzzy)))
+    if cached is not None:
+        return dict(cached)
+
+    features = LazyFeatures(raw_text, segment, fuzzy)
+
+    for field in fields:
+        features[field]
+    return features
+
+
+# ---------- Streaming Extraction ----------
+
+# Words of the previous chunk re-scanned with the next one, so degree
+# names and "5 + years" style mentions cut by a chunk edge are found.
+STREAM_OVERLAP_WORDS = 4
+
+
+def extract_features_stream(source, chunk_size: int = STREAM_CHUNK_SIZE) -> dict:
     """
-    # Use your existing preprocessing
-    pre = preprocess(raw_text)
-    clean_text = pre["clean_text"]
-    tokens = pre["tokens"]
+    extract_features() for documents too large to hold in memory
+    (long PDFs, publication lists). source is a file object or an
+    iterable of page texts; see preprocess.iter_text_chunks.
+
+    Tokens are fed to the phrase automaton as they are produced and the
+    experience / education scans run per chunk, so peak memory is about
+    one chunk. Returns the same fields as extract_features() except
+    clean_text and tokens, which would require the whole document.
+    """
+    state = {"years": None, "degrees": set(), "tail": ""}
+
+    def tokens():
+        for chunk in iter_text_chunks(source, chunk_size):
+            window = state["tail"] + chunk
+
+            years, degrees = extract_experience_and_education(window)
+            if years is not None and (state["years"] is None or years > state["years"]):
+                state["years"] = years
+            state["degrees"].update(degrees)
 
-    tech = extract_technical_skills(tokens, clean_text)
-    soft = extract_soft_skills(tokens, clean_text)
-    jd_kw = extract_jd_keywords(clean_text)
-    exp_years = extract_experience_years(raw_text)
-    degrees = extract_education(raw_text)
+            words = window.rsplit(None, STREAM_OVERLAP_WORDS)
+            state["tail"] = " ".join(words[-STREAM_OVERLAP_WORDS:]) + " "
+
+            for token in normalize_words(chunk):
+                if token not in STOPWORDS:
+                    yield token
+
+    terms = extract_dictionary_terms(tokens())
 
     return {
-        "clean_text": clean_text,
-        "tokens": tokens,
-        "technical_skills": sorted(tech),
-        "soft_skills": sorted(soft),
-        "jd_keywords": sorted(jd_kw),
-        "experience_years": exp_years,
-        "education": sorted(degrees),
+        "technical_skills": sorted(terms["technical"]),
+        "soft_skills": sorted(terms["soft"]),
+        "jd_keywords": sorted(terms["jd_keyword"]),
+        "experience_years": state["years"],
+        "education": sorted(state["degrees"]),
     }
 
 
@@ -180,15 +469,19 @@ if __name__ == "__main__":
     print("\nEDUCATION:\n", result["education"])
     print("\nJD KEYWORDS (if any):\n", result["jd_keywords"])
 
-def extract_resume_features(resume_text: str) -> dict:
+def extract_resume_features(resume_text: str, fields=None, fuzzy=None) -> dict:
     """
     Wrapper for clarity: extract features from a resume.
+    Experience and degrees are read from their own sections.
+    fuzzy defaults to the FUZZY_SKILL_MATCHING env setting.
     """
-    return extract_features(resume_text)
+    if fuzzy is None:
+        fuzzy = FUZZY_SKILL_MATCHING
+    return extract_features(resume_text, fields, segment=True, fuzzy=fuzzy)
 
 
-def extract_jd_features(jd_text: str) -> dict:
+def extract_jd_features(jd_text: str, fields=None) -> dict:
     """
     Wrapper for clarity: extract features from a job description.
     """
-    return extract_features(jd_text)
+    return extract_features(jd_text, fields)
@@ -0,0 +1,174 @@
+from typing import Dict, Iterable, Optional, Set
+
+
+# ---------- Edit Distance ----------
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions, so "pyhton" -> "python" costs 1). Returns
+    max_distance + 1 as soon as the distance is known to exceed it.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    prev_prev = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, prev_prev[j - 2] + 1)
+            cur[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        prev_prev, prev = prev, cur
+    return prev[-1]
+
+
+def skill_key(text: str) -> str:
+    """
+    Lookup form of a skill or token: lowercase letters and digits only,
+    so "Node.js", "node js" and "nodejs" share the key "nodejs".
+    """
+    return "".join(ch for ch in text.lower() if ch.isalnum())
+
+
+# Allowed typos by key length: short names are too easy to confuse
+# ("react" / "reach", "java" / "lava"), so they must match exactly.
+def max_distance_for(length: int) -> int:
+    if length <= 5:
+        return 0
+    if length <= 8:
+        return 1
+    return 2
+
+
+MAX_DISTANCE = 2
+
+
+# Lookups remembered per index before the memo is reset
+LOOKUP_MEMO_SIZE = 50000
+
+
+def _deletes(word: str, depth: int) -> Set[str]:
+    """
+    Every string obtained by deleting up to depth characters, the first
+    character excepted (matches must agree on it anyway).
+    """
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        nxt = set()
+        for item in frontier:
+            for i in range(1, len(item)):
+                nxt.add(item[:i] + item[i + 1:])
+        nxt -= found
+        found |= nxt
+        frontier = nxt
+    return found
+
+
+# ---------- Symmetric-delete Index ----------
+
+class FuzzySkillIndex:
+    """
+    SymSpell-style typo-tolerant lookup of dictionary skills.
+
+    Every skill key is stored together with all of its deletions (up to
+    max_distance_for(len(key)) characters). A query generates its own
+    deletions and intersects, so candidates are found with a few dict
+    lookups instead of comparing against the whole taxonomy; each
+    candidate is then confirmed with edit_distance(). Candidates must
+    also start with the same letter as the query. Results are memoized
+    per term, since resumes repeat the same vocabulary.
+    """
+
+    def __init__(self, skills: Iterable[str] = ()):
+        self.canonical: Dict[str, str] = {}     # key -> dictionary skill
+        self.deletes: Dict[str, list] = {}      # deletion -> [key, ...]
+        self.max_key_length = 0
+        self._memo: Dict[str, Optional[str]] = {}
+        for skill in skills:
+            self.add(skill)
+
+    def __len__(self):
+        return len(self.canonical)
+
+    def add(self, skill: str):
+        key = skill_key(skill)
+        if len(key) < 2 or key in self.canonical:
+            return
+        self.canonical[key] = skill
+        self.max_key_length = max(self.max_key_length, len(key))
+        self._memo.clear()
+        for variant in _deletes(key, max_distance_for(len(key))):
+            self.deletes.setdefault(variant, []).append(key)
+
+    def to_state(self) -> dict:
+        """
+        Plain-data form (for pickling / snapshots).
+        """
+        return {"canonical": self.canonical, "deletes": self.deletes, "max_key_length": self.max_key_length}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "FuzzySkillIndex":
+        index = cls()
+        index.canonical = state["canonical"]
+        index.deletes = state["deletes"]
+        index.max_key_length = state["max_key_length"]
+        return index
+
+    def lookup(self, term: str) -> Optional[str]:
+        """
+        Canonical skill for a token or joined bigram, or None.
+        Exact keys win; otherwise the closest candidate (ties broken
+        alphabetically) within its allowed distance.
+        """
+        skill = self._memo.get(term, False)
+        if skill is False:
+            if len(self._memo) >= LOOKUP_MEMO_SIZE:
+                self._memo.clear()
+            skill = self._memo[term] = self._lookup(skill_key(term))
+        return skill
+
+    def _lookup(self, key: str) -> Optional[str]:
+        skill = self.canonical.get(key)
+        if skill is not None:
+            return skill
+        if len(key) <= 5 or len(key) > self.max_key_length + MAX_DISTANCE:
+            return None
+
+        best = None
+        for variant in _deletes(key, MAX_DISTANCE):
+            for candidate in self.deletes.get(variant, ()):
+                if candidate[0] != key[0]:
+                    continue
+                allowed = max_distance_for(len(candidate))
+                distance = edit_distance(key, candidate, allowed)
+                if distance <= allowed and (best is None or (distance, candidate) < best):
+                    best = (distance, candidate)
+
+        return self.canonical[best[1]] if best else None
+
+    def find(self, tokens: Iterable[str]) -> Set[str]:
+        """
+        Skills matched by single tokens or by two adjacent tokens joined
+        ("postgre sql" -> postgresql, "java script" -> javascript).
+        """
+        found = set()
+        previous = None
+        for token in tokens:
+            skill = self.lookup(token)
+            if skill is not None:
+                found.add(skill)
+            if previous is not None:
+                skill = self.lookup(previous + token)
+                if skill is not None:
+                    found.add(skill)
+            previous = token
+        return found
@@ -0,0 +1,124 @@
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# ---------- Parameters ----------
+
+NUM_PERM = 128          # hash functions per signature
+LSH_BANDS = 16          # bands x rows must equal NUM_PERM
+LSH_ROWS = 8            # candidate pairs from ~0.7 Jaccard upwards
+SHINGLE_WORDS = 3       # words per shingle
+
+# Prime above 2**32 for the (a * x + b) mod p hash family; a and b stay
+# below 2**31 so a * x + b never overflows uint64.
+_PRIME = np.uint64(4294967311)
+_MASK = np.uint64(0xFFFFFFFF)
+
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 2 ** 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_B = _rng.randint(0, 2 ** 31, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+
+# ---------- Signatures ----------
+
+def shingle_hashes(text: str, size: int = SHINGLE_WORDS) -> np.ndarray:
+    """
+    Distinct CRC32 hashes of the word n-grams of a (processed) text.
+    """
+    words = (text or "").lower().split()
+    if not words:
+        grams = set()
+    elif len(words) < size:
+        grams = {" ".join(words)}
+    else:
+        grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64)
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """
+    NUM_PERM-value MinHash signature (uint32) of a text's shingles, or
+    None for texts without words (those are never duplicates).
+    """
+    hashes = shingle_hashes(text)
+    if hashes.size == 0:
+        return None
+
+    signature = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    # Column blocks keep the (NUM_PERM x block) temporary small
+    for start in range(0, hashes.size, 4096):
+        block = hashes[start:start + 4096]
+        values = ((np.outer(_A, block) + _B[:, None]) % _PRIME) & _MASK
+        np.minimum(signature, values.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def estimate_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+# ---------- LSH Index ----------
+
+class LSHIndex:
+    """
+    Banded locality-sensitive hashing over MinHash signatures.
+
+    Each signature is cut into LSH_BANDS bands of LSH_ROWS values; two
+    documents become candidates when any band is identical, which is
+    likely above ~0.7 Jaccard and unlikely well below. A query touches
+    LSH_BANDS buckets instead of every stored document; candidates are
+    then confirmed with the estimated Jaccard similarity.
+    """
+
+    def __init__(self, bands: int = LSH_BANDS, rows: int = LSH_ROWS):
+        if bands * rows != NUM_PERM:
+            raise ValueError("bands * rows must equal NUM_PERM")
+        self.bands = bands
+        self.rows = rows
+        self.buckets: List[Dict[bytes, List]] = [defaultdict(list) for _ in range(bands)]
+        self.signatures: Dict = {}
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.signatures
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[bytes]:
+        for band in range(self.bands):
+            yield signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, doc_id, signature: np.ndarray):
+        if doc_id in self.signatures:
+            return
+        self.signatures[doc_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self.buckets[band][key].append(doc_id)
+
+    def query(self, signature: np.ndarray, threshold: float) -> List[Tuple]:
+        """
+        [(doc_id, estimated_jaccard)] of stored documents at or above
+        threshold, most similar first (ties by doc_id).
+        """
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        matches = []
+        for doc_id in candidates:
+            similarity = estimate_jaccard(signature, self.signatures[doc_id])
+            if similarity >= threshold:
+                matches.append((doc_id, similarity))
+        matches.sort(key=lambda m: (-m[1], m[0]))
+        return matches
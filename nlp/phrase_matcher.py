@@ -0,0 +1,125 @@
+from collections import defaultdict
+
+
+# ---------- Token-level Aho-Corasick automaton ----------
+
+class PhraseMatcher:
+    """
+    Multi-pattern matcher over a token stream (Aho-Corasick on words).
+
+    Every dictionary phrase is split on spaces and inserted as a sequence
+    of tokens, so matches always start and end on token boundaries.
+    After build(), a single left-to-right pass over the tokens reports
+    every phrase (single-word or multi-word) that occurs in them,
+    together with the label(s) it was registered under.
+    """
+
+    def __init__(self):
+        self._goto = [{}]        # node -> {token: next node}
+        self._fail = [0]         # node -> failure link
+        self._output = [[]]      # node -> [(label, phrase), ...]
+        self._built = False
+
+    def add(self, phrase: str, label: str):
+        """
+        Register one phrase under a label (e.g. "technical", "soft").
+        """
+        words = phrase.split()
+        if not words:
+            return
+
+        node = 0
+        for word in words:
+            nxt = self._goto[node].get(word)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][word] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+
+        if (label, phrase) not in self._output[node]:
+            self._output[node].append((label, phrase))
+        self._built = False
+
+    def build(self):
+        """
+        Compute failure links (breadth-first) and merge outputs along them.
+        """
+        queue = []
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self._built = True
+        return self
+
+    def to_state(self) -> dict:
+        """
+        Plain-data form of a built matcher (for pickling / snapshots).
+        """
+        if not self._built:
+            self.build()
+        return {"goto": self._goto, "fail": self._fail, "output": self._output}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "PhraseMatcher":
+        matcher = cls()
+        matcher._goto = state["goto"]
+        matcher._fail = state["fail"]
+        matcher._output = state["output"]
+        matcher._built = True
+        return matcher
+
+    def iter_matches(self, tokens):
+        """
+        Yield (label, phrase) for every match in an iterable of tokens.
+        Works on lists as well as generators (one pass, O(len(tokens))).
+        """
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        node = 0
+        for token in tokens:
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if output[node]:
+                yield from output[node]
+
+    def find(self, tokens) -> dict:
+        """
+        Return {label: set(phrases)} for all matches in tokens.
+        """
+        found = defaultdict(set)
+        for label, phrase in self.iter_matches(tokens):
+            found[label].add(phrase)
+        return found
+
+
+def build_matcher(dictionaries: dict) -> PhraseMatcher:
+    """
+    Build a matcher from {label: [phrase, ...]}.
+    """
+    matcher = PhraseMatcher()
+    for label, phrases in dictionaries.items():
+        for phrase in phrases:
+            matcher.add(phrase, label)
+    return matcher.build()
@@ -1,3 +1,4 @@
+import codecs
 import re
 import string
 
@@ -15,30 +16,51 @@ STOPWORDS = {
     "not", "no", "yes"
 }
 
-def clean_text(text: str) -> str:
+# Compiled once at import and shared by every call
+URL_RE = re.compile(r"http\S+|www\.\S+")
+# An email match always spans a whole non-space run, so it is only
+# tried at run starts; the lookbehind saves rescanning every run from
+# each of its positions and finds the same matches.
+EMAIL_RE = re.compile(r"(?<!\S)\S+@\S+")
+NUMBER_RE = re.compile(r"\d+")
+# One byte-level table: ASCII digits -> space, ASCII punctuation deleted.
+# UTF-8 multi-byte sequences never contain ASCII bytes, so this is safe
+# on encoded non-ASCII text too.
+DIGIT_TO_SPACE_TABLE = bytes.maketrans(string.digits.encode(), b" " * len(string.digits))
+PUNCT_BYTES = string.punctuation.encode()
+
+def normalize_words(text: str) -> list:
     """
-    Lowercase, remove punctuation, numbers and extra spaces.
+    Words of clean_text(text), i.e. clean_text(text).split(" ").
+    Lowercase, drop URLs / emails / numbers / punctuation and split on
+    whitespace, skipping the URL and email patterns when the text
+    cannot contain them.
     """
     if not text:
-        return ""
+        return []
 
-    # Lowercase
     text = text.lower()
 
-    # Replace URLs and email addresses (optional, keeps things cleaner)
-    text = re.sub(r"http\S+|www\.\S+", " ", text)
-    text = re.sub(r"\S+@\S+", " ", text)
+    if "http" in text or "www." in text:
+        text = URL_RE.sub(" ", text)
 
-    # Remove numbers
-    text = re.sub(r"\d+", " ", text)
+    if "@" in text:
+        text = EMAIL_RE.sub(" ", text)
 
-    # Remove punctuation
-    text = text.translate(str.maketrans("", "", string.punctuation))
+    if not text.isascii():
+        # \d also covers non-ASCII digits, which the byte table cannot see
+        text = NUMBER_RE.sub(" ", text)
 
-    # Collapse multiple spaces into one
-    text = re.sub(r"\s+", " ", text).strip()
+    # Digits -> space and punctuation removal in one translate; splitting
+    # on any whitespace run then also collapses and strips spaces
+    data = text.encode("utf-8", "surrogatepass").translate(DIGIT_TO_SPACE_TABLE, PUNCT_BYTES)
+    return data.decode("utf-8", "surrogatepass").split()
 
-    return text
+def clean_text(text: str) -> str:
+    """
+    Lowercase, remove punctuation, numbers and extra spaces.
+    """
+    return " ".join(normalize_words(text))
 
 def tokenize(text: str) -> list:
     """
@@ -69,15 +91,74 @@ def preprocess(text: str) -> dict:
             "tokens": [...],
         }
     """
-    cleaned = clean_text(text)
-    tokens = tokenize(cleaned)
-    tokens_no_stop = remove_stopwords(tokens)
+    tokens_no_stop = [t for t in normalize_words(text) if t not in STOPWORDS]
 
     return {
         "clean_text": " ".join(tokens_no_stop),
         "tokens": tokens_no_stop,
     }
 
+# Default size of the text windows used by the streaming functions
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def _iter_raw_pieces(source, chunk_size: int):
+    """
+    Raw text pieces from a string, a file object (text or binary) or an
+    iterable of page texts. Pages are separated by a newline.
+    """
+    if isinstance(source, (str, bytes)):
+        pieces = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    elif hasattr(source, "read"):
+        pieces = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        pieces = (page + ("\n" if isinstance(page, str) else b"\n") for page in source)
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    for piece in pieces:
+        if isinstance(piece, bytes):
+            piece = decoder.decode(piece)
+        if piece:
+            yield piece
+    rest = decoder.decode(b"", final=True)
+    if rest:
+        yield rest
+
+def iter_text_chunks(source, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Re-cut any text source into chunks of roughly chunk_size characters
+    that only break on whitespace. Every normalization step works within
+    a single whitespace-delimited run, so each chunk can be cleaned on
+    its own. Memory stays bounded by chunk_size plus the longest run.
+    """
+    buffer = ""
+    for piece in _iter_raw_pieces(source, chunk_size):
+        buffer += piece
+        if len(buffer) < chunk_size:
+            continue
+        if buffer[-1].isspace():
+            yield buffer
+            buffer = ""
+            continue
+        parts = buffer.rsplit(None, 1)
+        if len(parts) < 2:
+            continue  # one unbroken run so far, keep reading
+        cut = len(buffer) - len(parts[1])
+        yield buffer[:cut]
+        buffer = buffer[cut:]
+    if buffer:
+        yield buffer
+
+def iter_tokens(source, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Streaming preprocess(): yields the same tokens as
+    preprocess(full_text)["tokens"] without ever holding the full text,
+    its cleaned copy or the full token list.
+    """
+    for chunk in iter_text_chunks(source, chunk_size):
+        for token in normalize_words(chunk):
+            if token not in STOPWORDS:
+                yield token
+
 # Quick manual test
 if __name__ == "__main__":
     sample_text = """
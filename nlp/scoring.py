@@ -1,9 +1,40 @@
 from typing import Dict, List, Set, Tuple
 
-from feature_extractor import (
-    extract_resume_features,
-    extract_jd_features,
-)
+try:
+    from .feature_extractor import (
+        extract_resume_features,
+        extract_jd_features,
+    )
+    from .bitset import (
+        popcount,
+        encode_feature_bits,
+        SKILL_VOCAB,
+        KEYWORD_VOCAB,
+        DEGREE_VOCAB,
+        FIELD_VOCABS,
+    )
+except ImportError:  # run as a script from inside nlp/
+    from feature_extractor import (
+        extract_resume_features,
+        extract_jd_features,
+    )
+    from bitset import (
+        popcount,
+        encode_feature_bits,
+        SKILL_VOCAB,
+        KEYWORD_VOCAB,
+        DEGREE_VOCAB,
+        FIELD_VOCABS,
+    )
+
+
+# Default component weights for the final Job Fit Score
+DEFAULT_WEIGHTS = {
+    "skills": 0.4,
+    "experience": 0.3,
+    "education": 0.15,
+    "keywords": 0.15,
+}
 
 
 # ---------- Skill Matching ----------
@@ -173,6 +204,7 @@ def calculate_fit_score(
     edu_score: float,
     keyword_match_percent: float,
     weights=None,
+    similarity: float = None,
 ) -> float:
     """
     Combine scores into final Job Fit Score using weights.
@@ -181,78 +213,432 @@ def calculate_fit_score(
         experience: 0.3
         education: 0.15
         keywords: 0.15
+
+    Optional component: weights["similarity"] times the whole-text
+    similarity (0-100, see text_index.py); raises ValueError when it is
+    weighted but not given. Components missing from weights have
+    weight 0.
     """
     if weights is None:
-        weights = {
-            "skills": 0.4,
-            "experience": 0.3,
-            "education": 0.15,
-            "keywords": 0.15,
-        }
+        weights = DEFAULT_WEIGHTS
 
-    final = (
-        skill_match_percent * weights["skills"] / 100.0 +
-        exp_score * weights["experience"] / 100.0 +
-        edu_score * weights["education"] / 100.0 +
-        keyword_match_percent * weights["keywords"] / 100.0
-    ) * 100.0
+    total = (
+        skill_match_percent * weights.get("skills", 0.0) / 100.0 +
+        exp_score * weights.get("experience", 0.0) / 100.0 +
+        edu_score * weights.get("education", 0.0) / 100.0 +
+        keyword_match_percent * weights.get("keywords", 0.0) / 100.0
+    )
+    if weights.get("similarity"):
+        if similarity is None:
+            raise ValueError("similarity is weighted but was not computed (pass a text_index)")
+        total += similarity * weights["similarity"] / 100.0
+    final = total * 100.0
 
     return round(final, 2)
 
 
+# ---------- Bitset Matching ----------
+# Same results as the list-based functions above, computed on
+# vocabulary bitsets (see bitset.py): overlaps are AND + popcount and
+# term lists are only decoded where a function returns them.
+
+def overlap_percent_bits(resume_bits: int, jd_bits: int) -> float:
+    """
+    match_percent of compute_skill_match / compute_keyword_match.
+    """
+    jd_count = popcount(jd_bits)
+    if jd_count == 0:
+        return 0.0
+    return round((popcount(resume_bits & jd_bits) / jd_count) * 100.0, 2)
+
+
+def education_score_bits(resume_bits: int, jd_bits: int) -> float:
+    """
+    score of compute_education_match.
+    """
+    if not jd_bits:
+        return 50.0 if resume_bits else 0.0
+    return 100.0 if resume_bits & jd_bits else 0.0
+
+
+def compute_skill_match_bits(resume_bits: int, jd_bits: int, vocab=SKILL_VOCAB) -> Dict:
+    return {
+        "matched": vocab.decode(resume_bits & jd_bits),
+        "missing": vocab.decode(jd_bits & ~resume_bits),
+        "extra": vocab.decode(resume_bits & ~jd_bits),
+        "match_percent": overlap_percent_bits(resume_bits, jd_bits),
+    }
+
+
+def compute_keyword_match_bits(resume_bits: int, jd_bits: int, vocab=KEYWORD_VOCAB) -> Dict:
+    return {
+        "matched": vocab.decode(resume_bits & jd_bits),
+        "missing": vocab.decode(jd_bits & ~resume_bits),
+        "match_percent": overlap_percent_bits(resume_bits, jd_bits),
+    }
+
+
+def compute_education_match_bits(resume_bits: int, jd_bits: int, vocab=DEGREE_VOCAB) -> Dict:
+    score = education_score_bits(resume_bits, jd_bits)
+    if not jd_bits:
+        status = "Unknown"
+    else:
+        status = "Matched" if score == 100.0 else "Not Matched"
+
+    return {
+        "resume_degrees": vocab.decode(resume_bits),
+        "jd_degrees": vocab.decode(jd_bits),
+        "status": status,
+        "score": score,
+    }
+
+
+def score_feature_bits(resume_bits: Dict, jd_bits: Dict, weights=None) -> float:
+    """
+    Job Fit Score from two encode_feature_bits() dicts without building
+    any matched/missing lists.
+    """
+    return calculate_fit_score(
+        skill_match_percent=overlap_percent_bits(resume_bits["technical_skills"], jd_bits["technical_skills"]),
+        exp_score=compute_experience_match(resume_bits["experience_years"], jd_bits["experience_years"])["score"],
+        edu_score=education_score_bits(resume_bits["education"], jd_bits["education"]),
+        keyword_match_percent=overlap_percent_bits(resume_bits["jd_keywords"], jd_bits["jd_keywords"]),
+        weights=weights,
+    )
+
+
+# ---------- Compiled Job ----------
+
+class CompiledJob:
+    """
+    A job description parsed once and reused for many resumes.
+    Holds the JD-side inputs of every matcher so that scoring a
+    resume only costs the resume-side extraction.
+    """
+
+    def __init__(self, jd_text: str):
+        self.jd_text = jd_text
+        self.features = extract_jd_features(jd_text)
+
+        self.skills = self.features["technical_skills"]
+        self.keywords = self.features["jd_keywords"]
+        self.experience_years = self.features["experience_years"]
+        self.degrees = self.features["education"]
+        self.bits = encode_feature_bits(self.features)
+
+    def __repr__(self):
+        return f"<CompiledJob skills={len(self.skills)} keywords={len(self.keywords)}>"
+
+
+def compile_job(jd_text: str) -> CompiledJob:
+    """
+    Parse a job description once for repeated scoring.
+    """
+    return CompiledJob(jd_text)
+
+
+# ---------- Component Registry ----------
+
+class ScoringComponent:
+    """
+    One part of the Job Fit Score.
+
+    - fields: resume features it reads (see FEATURE_FIELDS in
+      feature_extractor.py); only those are extracted when it runs.
+    - cost: rough relative cost of those features plus the comparison,
+      used to order the planned work (cheapest first).
+    - evaluate(resume_features, job, context) -> (score, detail): score
+      on 0-100 for calculate_fit_score, detail returned to the caller
+      under the component's name.
+    - requires: context keys that must be present (e.g. "text_index")
+      for the component to be planned.
+    """
+
+    def __init__(self, name: str, fields: Tuple[str, ...], cost: int, evaluate, requires: Tuple[str, ...] = ()):
+        self.name = name
+        self.fields = tuple(fields)
+        self.cost = cost
+        self.evaluate = evaluate
+        self.requires = tuple(requires)
+
+    def __repr__(self):
+        return f"<ScoringComponent {self.name} fields={self.fields} cost={self.cost}>"
+
+
+# name -> component, in result order
+SCORING_COMPONENTS: Dict[str, ScoringComponent] = {}
+
+
+def register_component(component: ScoringComponent) -> ScoringComponent:
+    SCORING_COMPONENTS[component.name] = component
+    return component
+
+
+def _evaluate_skills(resume_feat, job, context):
+    detail = compute_skill_match_bits(SKILL_VOCAB.encode(resume_feat["technical_skills"]), job.bits["technical_skills"])
+    return detail["match_percent"], detail
+
+
+def _evaluate_experience(resume_feat, job, context):
+    detail = compute_experience_match(resume_feat["experience_years"], job.experience_years)
+    return detail["score"], detail
+
+
+def _evaluate_education(resume_feat, job, context):
+    detail = compute_education_match_bits(DEGREE_VOCAB.encode(resume_feat["education"]), job.bits["education"])
+    return detail["score"], detail
+
+
+def _evaluate_keywords(resume_feat, job, context):
+    detail = compute_keyword_match_bits(KEYWORD_VOCAB.encode(resume_feat["jd_keywords"]), job.bits["jd_keywords"])
+    return detail["match_percent"], detail
+
+
+def _evaluate_similarity(resume_feat, job, context):
+    similarity = context["text_index"].score_tokens(resume_feat["tokens"], job.features["tokens"])
+    return similarity, similarity
+
+
+# Costs: experience / education are one regex pass over the raw text;
+# skills / keywords need tokenizing plus the dictionary automaton;
+# similarity additionally walks every token against the corpus stats.
+register_component(ScoringComponent("skills", ("technical_skills",), 2, _evaluate_skills))
+register_component(ScoringComponent("experience", ("experience_years",), 1, _evaluate_experience))
+register_component(ScoringComponent("education", ("education",), 1, _evaluate_education))
+register_component(ScoringComponent("keywords", ("jd_keywords",), 2, _evaluate_keywords))
+register_component(ScoringComponent("similarity", ("tokens",), 3, _evaluate_similarity, requires=("text_index",)))
+
+# Non-component outputs evaluate_* can return
+FEATURE_OUTPUTS = ("resume_features", "jd_features")
+
+
+# ---------- Planner ----------
+
+class EvaluationPlan:
+    """
+    What an evaluation has to do for given weights and outputs:
+    the components to run (cheapest first) and the resume fields to
+    extract (None = the full, cached feature dict).
+    """
+
+    def __init__(self, components: List[ScoringComponent], fields, outputs: Set[str]):
+        self.components = components
+        self.fields = fields
+        self.outputs = outputs
+
+    def __repr__(self):
+        return f"<EvaluationPlan components={[c.name for c in self.components]} fields={self.fields}>"
+
+
+def plan_evaluation(weights=None, outputs=None, context=None) -> EvaluationPlan:
+    """
+    Plan the minimal work for a weight profile.
+
+    outputs: names of the components and/or FEATURE_OUTPUTS the caller
+    wants back. None means the full classic result (every default
+    component plus both feature dicts). Components with a zero (or no)
+    weight that are not requested are skipped along with the
+    extraction stages only they need. A planned component missing a
+    required context entry (similarity without a text_index) raises
+    ValueError.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    context = context or {}
+
+    if outputs is None:
+        # Classic result; similarity is returned whenever it is weighted
+        outputs = set(DEFAULT_WEIGHTS) | set(FEATURE_OUTPUTS)
+        if weights.get("similarity"):
+            outputs.add("similarity")
+    else:
+        outputs = set(outputs)
+        unknown = outputs - set(SCORING_COMPONENTS) - set(FEATURE_OUTPUTS)
+        if unknown:
+            raise ValueError(f"Unknown outputs: {', '.join(sorted(unknown))}")
+
+    components = [
+        component for name, component in SCORING_COMPONENTS.items()
+        if weights.get(name) or name in outputs
+    ]
+    for component in components:
+        missing = [key for key in component.requires if context.get(key) is None]
+        if missing:
+            raise ValueError(f"Component '{component.name}' needs {', '.join(missing)}")
+    components.sort(key=lambda c: c.cost)
+
+    if "resume_features" in outputs:
+        fields = None
+    else:
+        fields = tuple(dict.fromkeys(field for c in components for field in c.fields))
+    return EvaluationPlan(components, fields, outputs)
+
+
 # ---------- Main API ----------
 
-def evaluate_resume_against_jd(resume_text: str, jd_text: str) -> Dict:
+def _run_plan(plan: EvaluationPlan, resume_text: str, job: CompiledJob, weights, context):
+    """
+    Extract the planned resume fields and run the planned components.
+    Returns (resume_features, job_fit_score, scores, details).
+    """
+    resume_feat = extract_resume_features(resume_text, fields=plan.fields)
+
+    scores = {}
+    details = {}
+    for component in plan.components:
+        scores[component.name], details[component.name] = component.evaluate(resume_feat, job, context)
+
+    # Final score
+    final_score = calculate_fit_score(
+        skill_match_percent=scores.get("skills", 0.0),
+        exp_score=scores.get("experience", 0.0),
+        edu_score=scores.get("education", 0.0),
+        keyword_match_percent=scores.get("keywords", 0.0),
+        weights=weights,
+        similarity=scores.get("similarity"),
+    )
+    return resume_feat, final_score, scores, details
+
+
+def evaluate_resume_against_compiled_job(resume_text: str, job: CompiledJob, weights=None, text_index=None,
+                                         outputs=None) -> Dict:
+    """
+    Same as evaluate_resume_against_jd, but against an already
+    compiled job: only the resume is extracted here.
+
+    weights: component weights (DEFAULT_WEIGHTS if None). When they
+    include "similarity", the BM25 similarity of resume and JD against
+    the text_index (SparseTextIndex) corpus is added to the score and
+    returned under "similarity"; ValueError without a text_index.
+
+    outputs: see plan_evaluation. With custom outputs only the
+    components that are weighted or requested are computed, and only
+    the resume fields they read are extracted; the Job Fit Score is the
+    same, since skipped components have zero weight.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    context = {"text_index": text_index}
+    plan = plan_evaluation(weights, outputs, context)
+    resume_feat, final_score, _, details = _run_plan(plan, resume_text, job, weights, context)
+
+    result = {"job_fit_score": final_score}
+    for name in SCORING_COMPONENTS:
+        if name in details and name in plan.outputs:
+            result[name] = details[name]
+    if "resume_features" in plan.outputs:
+        result["resume_features"] = resume_feat
+    if "jd_features" in plan.outputs:
+        result["jd_features"] = job.features
+    return result
+
+
+def evaluate_resume_against_jd(resume_text: str, jd_text: str, weights=None, text_index=None, outputs=None) -> Dict:
     """
     High-level function:
     - Extract features from resume and JD
     - Compute all partial scores
     - Compute final Job Fit Score
     """
-    resume_feat = extract_resume_features(resume_text)
-    jd_feat = extract_jd_features(jd_text)
+    return evaluate_resume_against_compiled_job(resume_text, compile_job(jd_text), weights, text_index, outputs)
 
-    # Technical skills
-    skill_match = compute_skill_match(
-        resume_feat["technical_skills"],
-        jd_feat["technical_skills"],
-    )
 
-    # Experience
-    exp_match = compute_experience_match(
-        resume_feat["experience_years"],
-        jd_feat["experience_years"],
-    )
+def evaluate_many(job: CompiledJob, resume_texts, weights=None, text_index=None, outputs=None) -> List[Dict]:
+    """
+    Score many resumes against one job. The JD is not re-extracted:
+    pass a CompiledJob (or raw JD text, which is compiled once here).
+    Returns one result per resume, in input order.
+    """
+    if not isinstance(job, CompiledJob):
+        job = compile_job(job)
+    return [evaluate_resume_against_compiled_job(text, job, weights, text_index, outputs) for text in resume_texts]
 
-    # Education
-    edu_match = compute_education_match(
-        resume_feat["education"],
-        jd_feat["education"],
-    )
 
-    # Keywords (we'll reuse jd_keywords sets)
-    kw_match = compute_keyword_match(
-        resume_feat["jd_keywords"],
-        jd_feat["jd_keywords"],
-    )
+# ---------- Compact Results ----------
 
-    # Final score
-    final_score = calculate_fit_score(
-        skill_match_percent=skill_match["match_percent"],
-        exp_score=exp_match["score"],
-        edu_score=edu_match["score"],
-        keyword_match_percent=kw_match["match_percent"],
-    )
+# Term fields kept as bitmaps in a CompactResult
+COMPACT_BIT_FIELDS = ("technical_skills", "jd_keywords", "education")
 
-    return {
-        "job_fit_score": final_score,
-        "skills": skill_match,
-        "experience": exp_match,
-        "education": edu_match,
-        "keywords": kw_match,
-        "resume_features": resume_feat,
-        "jd_features": jd_feat,
+# Components always evaluated for a CompactResult: together they read
+# every field explain() needs
+COMPACT_OUTPUTS = ("skills", "experience", "education", "keywords")
+
+
+class CompactResult:
+    """
+    Score-only evaluation: the Job Fit Score, the partial scores and the
+    resume's skill / keyword / degree sets as vocabulary bitmaps (see
+    bitset.py). No term lists, tokens or feature dicts are kept; the job
+    is shared by reference. explain() expands it on demand.
+    """
+
+    __slots__ = ("job_fit_score", "scores", "bits", "experience_years", "job")
+
+    def __init__(self, job_fit_score: float, scores: Dict, bits: Dict, experience_years, job: CompiledJob):
+        self.job_fit_score = job_fit_score
+        self.scores = scores
+        self.bits = bits
+        self.experience_years = experience_years
+        self.job = job
+
+    def to_dict(self) -> Dict:
+        """
+        JSON-friendly form; bitmaps as hex strings.
+        """
+        return {
+            "job_fit_score": self.job_fit_score,
+            "scores": dict(self.scores),
+            "bits": {field: format(value, "x") for field, value in self.bits.items()},
+            "experience_years": self.experience_years,
+        }
+
+    def __repr__(self):
+        return f"<CompactResult score={self.job_fit_score}>"
+
+
+def score_resume_compact(resume_text: str, job: CompiledJob, weights=None, text_index=None) -> CompactResult:
+    """
+    Score-only form of evaluate_resume_against_compiled_job: the same
+    planned component evaluation (COMPACT_OUTPUTS, plus similarity when
+    weighted), but only the scores and the resume's term bitmaps are
+    kept; the detail dicts are dropped.
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    context = {"text_index": text_index}
+    plan = plan_evaluation(weights, COMPACT_OUTPUTS, context)
+    resume_feat, final_score, scores, _ = _run_plan(plan, resume_text, job, weights, context)
+
+    bits = {field: FIELD_VOCABS[field].encode(resume_feat[field]) for field in COMPACT_BIT_FIELDS}
+    return CompactResult(final_score, scores, bits, resume_feat["experience_years"], job)
+
+
+def evaluate_many_compact(job: CompiledJob, resume_texts, weights=None, text_index=None) -> List[CompactResult]:
+    """
+    evaluate_many with CompactResult items (in input order).
+    """
+    if not isinstance(job, CompiledJob):
+        job = compile_job(job)
+    return [score_resume_compact(text, job, weights, text_index) for text in resume_texts]
+
+
+def explain(result: CompactResult) -> Dict:
+    """
+    Human-readable breakdown of a CompactResult: the same skills,
+    experience, education and keywords entries (matched / missing /
+    extra lists) as evaluate_resume_against_compiled_job returns.
+    """
+    job = result.job
+    explained = {
+        "job_fit_score": result.job_fit_score,
+        "skills": compute_skill_match_bits(result.bits["technical_skills"], job.bits["technical_skills"]),
+        "experience": compute_experience_match(result.experience_years, job.experience_years),
+        "education": compute_education_match_bits(result.bits["education"], job.bits["education"]),
+        "keywords": compute_keyword_match_bits(result.bits["jd_keywords"], job.bits["jd_keywords"]),
     }
+    if "similarity" in result.scores:
+        explained["similarity"] = result.scores["similarity"]
+    return explained
 
 
 # ---------- Quick Manual Test ----------
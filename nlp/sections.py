@@ -0,0 +1,97 @@
+import re
+from typing import Dict
+
+
+# ---------- Heading Dictionary ----------
+
+SECTION_NAMES = ("skills", "experience", "education", "projects", "other")
+
+# section -> headings that open it (compared after normalize_heading)
+SECTION_HEADINGS = {
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills", "skill set", "skillset",
+        "core competencies", "competencies", "technologies", "tools", "tools and technologies",
+        "tech stack", "technical proficiency", "areas of expertise",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history",
+        "internship", "internships", "internship experience",
+    ],
+    "education": [
+        "education", "educational background", "academic background", "academics",
+        "qualifications", "educational qualifications", "academic qualifications",
+        "education and training",
+    ],
+    "projects": [
+        "projects", "academic projects", "personal projects", "key projects",
+        "major projects", "project experience", "project work",
+    ],
+    "other": [
+        "summary", "professional summary", "profile", "career objective", "objective",
+        "about me", "certifications", "certificates", "achievements", "awards",
+        "publications", "interests", "hobbies", "languages", "references",
+        "extracurricular activities", "personal details", "contact",
+    ],
+}
+
+HEADING_TO_SECTION = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+# Longer lines are treated as content even if they start like a heading
+MAX_HEADING_LENGTH = 40
+
+_DECORATION = " \t#*-•=_|:>.•●▪"
+_SPACES_RE = re.compile(r"\s+")
+
+
+def normalize_heading(line: str) -> str:
+    line = line.strip(_DECORATION).lower().replace("&", "and")
+    return _SPACES_RE.sub(" ", line)
+
+
+def detect_heading(line: str):
+    """
+    Return (section, rest_of_line) if the line is a section heading,
+    e.g. "WORK EXPERIENCE", "## Projects", "Skills: Python, SQL";
+    otherwise None.
+    """
+    stripped = line.strip()
+    if not stripped:
+        return None
+
+    head, sep, rest = stripped.partition(":")
+    if len(head) > MAX_HEADING_LENGTH:
+        return None
+
+    section = HEADING_TO_SECTION.get(normalize_heading(head))
+    if section is None:
+        return None
+    return section, rest.strip() if sep else ""
+
+
+# ---------- Segmenter ----------
+
+def segment_sections(raw_text: str) -> Dict[str, str]:
+    """
+    Split a resume into sections with one pass over its lines.
+    Returns {section: text} for the sections present (names from
+    SECTION_NAMES), heading lines left out. Text before the first
+    heading goes to "other", so a resume without recognizable headings
+    comes back whole as {"other": raw_text}.
+    """
+    parts = {}
+    current = "other"
+
+    for line in (raw_text or "").splitlines():
+        heading = detect_heading(line)
+        if heading is not None:
+            current, line = heading
+            if not line:
+                continue
+        parts.setdefault(current, []).append(line)
+
+    return {name: "\n".join(lines) for name, lines in parts.items()}
@@ -0,0 +1,190 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, List
+
+try:
+    from .scoring import (
+        CompiledJob,
+        compile_job,
+        compute_skill_match_bits,
+        compute_experience_match,
+        compute_education_match_bits,
+        compute_keyword_match_bits,
+        calculate_fit_score,
+        score_feature_bits,
+    )
+    from .bitset import FIELD_VOCABS
+except ImportError:  # run as a script from inside nlp/
+    from scoring import (
+        CompiledJob,
+        compile_job,
+        compute_skill_match_bits,
+        compute_experience_match,
+        compute_education_match_bits,
+        compute_keyword_match_bits,
+        calculate_fit_score,
+        score_feature_bits,
+    )
+    from bitset import FIELD_VOCABS
+
+
+# Feature fields that get postings lists
+INDEXED_FIELDS = ("technical_skills", "jd_keywords", "education")
+
+
+# ---------- Inverted Index ----------
+
+class SkillIndex:
+    """
+    Inverted index: (field, term) -> set of resume IDs (ints, e.g.
+    Resume.id), plus the few per-resume features needed to finish a
+    score, kept as vocabulary bitsets (see bitset.py) plus experience
+    years.
+
+    top_k() only fully evaluates resumes whose score upper bound can
+    still beat the current K-th best score.
+    """
+
+    def __init__(self):
+        self.postings = {field: defaultdict(set) for field in INDEXED_FIELDS}
+        self.docs = {}
+        self.last_query_stats = {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, resume_id):
+        return resume_id in self.docs
+
+    def add(self, resume_id, features: Dict):
+        """
+        Index (or re-index) one resume from its extracted features.
+        """
+        if resume_id in self.docs:
+            self.remove(resume_id)
+
+        doc = {field: FIELD_VOCABS[field].encode(features.get(field) or []) for field in INDEXED_FIELDS}
+        doc["experience_years"] = features.get("experience_years")
+        self.docs[resume_id] = doc
+
+        for field in INDEXED_FIELDS:
+            for term in FIELD_VOCABS[field].decode(doc[field]):
+                self.postings[field][term].add(resume_id)
+
+    def remove(self, resume_id):
+        doc = self.docs.pop(resume_id, None)
+        if doc is None:
+            return
+        for field in INDEXED_FIELDS:
+            for term in FIELD_VOCABS[field].decode(doc[field]):
+                ids = self.postings[field].get(term)
+                if ids is not None:
+                    ids.discard(resume_id)
+                    if not ids:
+                        del self.postings[field][term]
+
+    # ---------- Query ----------
+
+    def _overlap_counts(self, field: str, terms) -> Dict:
+        counts = defaultdict(int)
+        postings = self.postings[field]
+        for term in set(terms):
+            for resume_id in postings.get(term, ()):
+                counts[resume_id] += 1
+        return counts
+
+    def _explain(self, resume_id, score: float, job: CompiledJob) -> Dict:
+        """
+        Full result for a resume that made it into the top K.
+        """
+        doc = self.docs[resume_id]
+        skill_match = compute_skill_match_bits(doc["technical_skills"], job.bits["technical_skills"])
+        exp_match = compute_experience_match(doc["experience_years"], job.experience_years)
+        edu_match = compute_education_match_bits(doc["education"], job.bits["education"])
+        kw_match = compute_keyword_match_bits(doc["jd_keywords"], job.bits["jd_keywords"])
+
+        return {
+            "resume_id": resume_id,
+            "job_fit_score": score,
+            "skills": skill_match,
+            "experience": exp_match,
+            "education": edu_match,
+            "keywords": kw_match,
+        }
+
+    def top_k(self, job, k: int = 10, weights=None) -> List[Dict]:
+        """
+        Return the k best resumes for a job (CompiledJob or JD text),
+        best first, ties broken by resume ID (lowest first; resume IDs
+        must be ints). Same scores as evaluate_resume_against_jd on the
+        indexed features.
+
+        Skill, keyword and degree overlaps come straight from the
+        postings lists; experience is bounded by its best possible
+        score. Candidates are visited in decreasing upper-bound order
+        and the scan stops once no remaining bound can beat the K-th
+        best exact score. Resumes sharing no term with the job form a
+        single group with one bound and are only visited if needed.
+        """
+        if not isinstance(job, CompiledJob):
+            job = compile_job(job)
+        if k <= 0 or not self.docs:
+            self.last_query_stats = {"candidates": 0, "evaluated": 0}
+            return []
+
+        skill_counts = self._overlap_counts("technical_skills", job.skills)
+        kw_counts = self._overlap_counts("jd_keywords", job.keywords)
+        edu_counts = self._overlap_counts("education", job.degrees)
+
+        n_skills = len(set(job.skills))
+        n_keywords = len(set(job.keywords))
+
+        # Experience can score at most 100 (50 when the JD has no
+        # requirement); education likewise at most 50 without JD degrees.
+        exp_bound = 100.0 if job.experience_years is not None else 50.0
+        edu_default = 0.0 if job.degrees else 50.0
+
+        def upper_bound(resume_id):
+            skill_pct = round(skill_counts.get(resume_id, 0) / n_skills * 100.0, 2) if n_skills else 0.0
+            kw_pct = round(kw_counts.get(resume_id, 0) / n_keywords * 100.0, 2) if n_keywords else 0.0
+            edu = 100.0 if edu_counts.get(resume_id) else edu_default
+            return calculate_fit_score(skill_pct, exp_bound, edu, kw_pct, weights=weights)
+
+        candidates = set(skill_counts) | set(kw_counts) | set(edu_counts)
+        bounded = sorted(((upper_bound(rid), rid) for rid in candidates), key=lambda x: (-x[0], x[1]))
+
+        heap = []           # min-heap of (score, -resume_id)
+        evaluated = 0
+
+        def offer(resume_id):
+            nonlocal evaluated
+            evaluated += 1
+            item = (score_feature_bits(self.docs[resume_id], job.bits, weights=weights), -resume_id)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+        def can_enter(bound):
+            return len(heap) < k or bound >= heap[0][0]
+
+        for bound, resume_id in bounded:
+            if not can_enter(bound):
+                break
+            offer(resume_id)
+
+        # Resumes without any overlapping term share one upper bound
+        rest_bound = calculate_fit_score(0.0, exp_bound, edu_default, 0.0, weights=weights)
+        if len(candidates) < len(self.docs):
+            for resume_id in self.docs:
+                if len(heap) == k and heap[0][0] >= rest_bound:
+                    if heap[0][0] > rest_bound:
+                        break
+                    # Tied with the K-th score: only a lower ID can still enter
+                    if -resume_id <= heap[0][1]:
+                        continue
+                if resume_id not in candidates:
+                    offer(resume_id)
+
+        self.last_query_stats = {"candidates": len(candidates), "evaluated": evaluated}
+        return [self._explain(-neg_id, score, job) for score, neg_id in sorted(heap, reverse=True)]
@@ -0,0 +1,225 @@
+import math
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+# BM25 parameters (term-frequency saturation, length normalization)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+# ---------- Sparse BM25 Index ----------
+
+class SparseTextIndex:
+    """
+    Whole-text similarity over a pool of documents (resumes), BM25
+    weighted and stored as a SciPy CSR matrix: one row per document,
+    one column per term.
+
+    Term counts and document frequencies are updated incrementally by
+    add() / remove(); the weighted matrix is rebuilt lazily (one
+    vectorized O(nnz) pass) on the first query after a change. Scoring a
+    query against the whole pool is then a single sparse matrix-vector
+    product.
+
+    Scores are normalized to 0-100: 100 would mean the document contains
+    every distinct query term with saturated frequency.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+
+        self.vocab: Dict[str, int] = {}
+        self.doc_freq = array("l")          # column -> number of live docs containing it
+
+        # Raw term counts, appended row by row (CSR layout)
+        self._indptr = array("l", [0])
+        self._indices = array("l")
+        self._counts = array("f")
+        self._doc_len = array("f")
+        self._row_ids: List = []            # row -> doc id (None once removed)
+        self._row_of: Dict = {}             # doc id -> row
+
+        self._total_len = 0.0
+        self._matrix = None                 # BM25-weighted CSR, None when stale
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._row_of
+
+    # ---------- Updates ----------
+
+    def add(self, doc_id, tokens: Iterable[str]):
+        """
+        Index (or re-index) one document from its tokens.
+        """
+        counts = Counter(tokens)
+        cols = []
+        for term in counts:
+            col = self.vocab.get(term)
+            if col is None:
+                col = self.vocab[term] = len(self.vocab)
+                self.doc_freq.append(0)
+            cols.append(col)
+        self._append_row(doc_id, cols, counts.values())
+
+    def copy(self, doc_id, source_id) -> bool:
+        """
+        Index doc_id with the term counts of source_id (e.g. a duplicate
+        document) instead of its tokens. False if source_id is not
+        indexed.
+        """
+        row = self._row_of.get(source_id)
+        if row is None:
+            return False
+        start, end = self._indptr[row], self._indptr[row + 1]
+        self._append_row(doc_id, self._indices[start:end], self._counts[start:end])
+        return True
+
+    def _append_row(self, doc_id, cols, counts):
+        if doc_id in self._row_of:
+            self.remove(doc_id)
+
+        length = 0.0
+        for col, count in zip(cols, counts):
+            self.doc_freq[col] += 1
+            self._indices.append(col)
+            self._counts.append(count)
+            length += count
+
+        self._indptr.append(len(self._indices))
+        self._doc_len.append(length)
+        self._row_of[doc_id] = len(self._row_ids)
+        self._row_ids.append(doc_id)
+        self._total_len += length
+        self._matrix = None
+
+    def remove(self, doc_id):
+        row = self._row_of.pop(doc_id, None)
+        if row is None:
+            return
+        start, end = self._indptr[row], self._indptr[row + 1]
+        for col in self._indices[start:end]:
+            self.doc_freq[col] -= 1
+        self._total_len -= self._doc_len[row]
+        self._row_ids[row] = None
+        self._matrix = None
+
+    def _compact(self):
+        """
+        Drop the rows of removed documents from the raw arrays.
+        """
+        live = np.array([doc_id is not None for doc_id in self._row_ids], dtype=bool)
+        if live.all():
+            return
+
+        lengths = np.diff(np.array(self._indptr, dtype=np.int64))
+        keep = np.repeat(live, lengths)
+
+        self._indices = array("l", np.array(self._indices, dtype=np.int64)[keep].tolist())
+        self._counts = array("f", np.array(self._counts, dtype=np.float32)[keep].tolist())
+        self._indptr = array("l", [0] + np.cumsum(lengths[live]).tolist())
+        self._doc_len = array("f", np.array(self._doc_len, dtype=np.float32)[live].tolist())
+        self._row_ids = [doc_id for doc_id in self._row_ids if doc_id is not None]
+        self._row_of = {doc_id: row for row, doc_id in enumerate(self._row_ids)}
+
+    # ---------- Statistics ----------
+
+    def idf(self, term: str) -> float:
+        col = self.vocab.get(term)
+        df = self.doc_freq[col] if col is not None else 0
+        n = len(self._row_of)
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def average_length(self) -> float:
+        n = len(self._row_of)
+        return self._total_len / n if n else 0.0
+
+    def _weighted_matrix(self):
+        """
+        BM25 term weights (without IDF) for every stored document.
+        """
+        if self._matrix is None:
+            self._compact()
+            counts = np.array(self._counts, dtype=np.float32)
+            indptr = np.array(self._indptr, dtype=np.int64)
+            doc_len = np.array(self._doc_len, dtype=np.float32)
+
+            avg_len = self.average_length() or 1.0
+            norm = self.k1 * (1.0 - self.b + self.b * doc_len / avg_len)
+            norm_per_entry = np.repeat(norm, np.diff(indptr))
+            data = counts * (self.k1 + 1.0) / (counts + norm_per_entry)
+
+            self._matrix = sparse.csr_matrix(
+                (data, np.array(self._indices, dtype=np.int64), indptr),
+                shape=(len(self._row_ids), len(self.vocab)),
+            )
+        return self._matrix
+
+    # ---------- Queries ----------
+
+    def _query(self, query_tokens: Iterable[str]) -> Tuple[Dict[str, float], float]:
+        """
+        IDF of every distinct query term and the best attainable score.
+        """
+        weights = {term: self.idf(term) for term in set(query_tokens)}
+        best = sum(weights.values()) * (self.k1 + 1.0)
+        return weights, best
+
+    def scores(self, query_tokens: Iterable[str]) -> Tuple[List, np.ndarray]:
+        """
+        (doc_ids, scores) for every indexed document, scores on 0-100.
+        """
+        matrix = self._weighted_matrix()
+        weights, best = self._query(query_tokens)
+        if not best or matrix.shape[0] == 0:
+            return list(self._row_ids), np.zeros(matrix.shape[0], dtype=np.float32)
+
+        query = np.zeros(matrix.shape[1], dtype=np.float32)
+        for term, weight in weights.items():
+            col = self.vocab.get(term)
+            if col is not None:
+                query[col] = weight
+
+        return list(self._row_ids), (matrix @ query) * (100.0 / best)
+
+    def top_k(self, query_tokens: Iterable[str], k: int = 10) -> List[Tuple]:
+        """
+        [(doc_id, score)] of the k best documents, best first; usable as
+        a cheap retrieval stage before full scoring.
+        """
+        doc_ids, scores = self.scores(query_tokens)
+        if k <= 0 or not doc_ids:
+            return []
+        k = min(k, len(doc_ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = sorted(top, key=lambda row: (-scores[row], row))
+        return [(doc_ids[row], round(float(scores[row]), 2)) for row in top]
+
+    def score_tokens(self, doc_tokens: Iterable[str], query_tokens: Iterable[str]) -> float:
+        """
+        Similarity (0-100) of a single document, indexed or not, using
+        the pool's IDF and average length.
+        """
+        weights, best = self._query(query_tokens)
+        if not best:
+            return 0.0
+
+        counts = Counter(doc_tokens)
+        doc_len = float(sum(counts.values()))
+        avg_len = self.average_length() or doc_len or 1.0
+        norm = self.k1 * (1.0 - self.b + self.b * doc_len / avg_len)
+
+        score = 0.0
+        for term, weight in weights.items():
+            tf = counts.get(term)
+            if tf:
+                score += weight * tf * (self.k1 + 1.0) / (tf + norm)
+        return round(score * 100.0 / best, 2)
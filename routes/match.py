@@ -1,17 +1,116 @@
 # routes/match.py
 from flask import Blueprint, request, jsonify
-from services.matcher import calculate_match_score
+from services.matcher import calculate_match_score, MATCH_MODES
+from services.resume_index import top_k_resumes
+from services.text_search import search_resumes, get_text_index
+from services.rerank import normalize_weights
+from nlp.scoring import SCORING_COMPONENTS, evaluate_resume_against_jd
+from services.semantic_search import nearest_resumes
 
 match_bp = Blueprint('match_bp', __name__)
 
+# Largest number of results a match endpoint returns
+MAX_K = 100
+
+
+def _parse_k(data):
+    '''
+    Requested result count (default 10), clamped to 1..MAX_K; None when
+    k is not an integer.
+    '''
+    value = data.get('k', 10)
+    if isinstance(value, bool) or isinstance(value, float):
+        return None
+    try:
+        k = int(value)
+    except (TypeError, ValueError):
+        return None
+    return max(1, min(k, MAX_K))
+
+
 @match_bp.route('/score', methods=['POST'])
 def score_resume():
     data = request.get_json()
     resume_text = data.get('resume_text', '')
     job_text = data.get('job_text', '')
+    mode = data.get('mode')
 
     if not resume_text or not job_text:
         return jsonify({'error': 'Both resume_text and job_text are required'}), 400
+    if mode is not None and mode not in MATCH_MODES:
+        return jsonify({'error': f"mode must be one of: {', '.join(MATCH_MODES)}"}), 400
 
-    score = calculate_match_score(resume_text, job_text)
+    score = calculate_match_score(resume_text, job_text, mode=mode)
     return jsonify({'match_score': score})
+
+
+@match_bp.route('/fit', methods=['POST'])
+def fit_score():
+    '''
+    Rule-based Job Fit Score with optional component weights; a
+    "similarity" weight scores BM25 similarity against the stored pool.
+    '''
+    data = request.get_json()
+    resume_text = data.get('resume_text', '')
+    job_text = data.get('job_text', '')
+    weights = data.get('weights') or {}
+
+    if not resume_text or not job_text:
+        return jsonify({'error': 'Both resume_text and job_text are required'}), 400
+    if not isinstance(weights, dict):
+        return jsonify({'error': 'weights must be an object'}), 400
+    try:
+        weights = normalize_weights(weights, tuple(SCORING_COMPONENTS))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    text_index = get_text_index() if weights.get('similarity') else None
+    outputs = [name for name in SCORING_COMPONENTS if weights.get(name)]
+    result = evaluate_resume_against_jd(resume_text, job_text, weights, text_index, outputs)
+    return jsonify(result)
+
+
+@match_bp.route('/top-k', methods=['POST'])
+def top_k():
+    data = request.get_json()
+    job_text = data.get('job_text', '')
+    k = _parse_k(data)
+
+    if not job_text:
+        return jsonify({'error': 'job_text is required'}), 400
+    if k is None:
+        return jsonify({'error': 'k must be an integer'}), 400
+
+    results, stats = top_k_resumes(job_text, k)
+    return jsonify({'results': results, 'stats': stats})
+
+
+@match_bp.route('/search', methods=['POST'])
+def search():
+    data = request.get_json()
+    job_text = data.get('job_text', '')
+    k = _parse_k(data)
+
+    if not job_text:
+        return jsonify({'error': 'job_text is required'}), 400
+    if k is None:
+        return jsonify({'error': 'k must be an integer'}), 400
+
+    return jsonify({'results': search_resumes(job_text, k)})
+
+
+@match_bp.route('/semantic', methods=['POST'])
+def semantic():
+    data = request.get_json()
+    job_text = data.get('job_text', '')
+    k = _parse_k(data)
+
+    if not job_text:
+        return jsonify({'error': 'job_text is required'}), 400
+    if k is None:
+        return jsonify({'error': 'k must be an integer'}), 400
+
+    results = nearest_resumes(job_text, k)
+    if results is None:
+        return jsonify({'error': 'Embedding index not built (python -m services.semantic_search)'}), 503
+    return jsonify({'results': results})
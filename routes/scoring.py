@@ -1,9 +1,10 @@
 from flask import Blueprint, request, jsonify
-from app import db
+from extensions import db
 from models.resume import Resume
 from models.job import Job
 from models.scoring import ScoringResult
 from services.ai_scorer import AIScorer
+from services.rerank import score_and_store, rerank_job
 import uuid
 import time
 
@@ -50,6 +51,7 @@ def score_resume():
             skills_score=scoring_data['skills_score'],
             experience_score=scoring_data['experience_score'],
             education_score=scoring_data['education_score'],
+            keywords_score=scoring_data.get('keywords_score', 0.0),
             ai_model_used=scoring_data.get('model', 'unknown'),
             processing_time=processing_time,
             confidence=scoring_data.get('confidence', 0.0)
@@ -108,6 +110,12 @@ def batch_score():
         results = []
         errors = []
 
+        # Near-duplicate resumes (Resume.duplicate_of) share one score.
+        # Only within this batch: AIScorer results are stored per
+        # (resume, job) and every batch creates a new job, so another
+        # batch scores the duplicate group again.
+        scored = {}
+
         for resume_id in resume_ids:
             try:
                 resume = Resume.query.get(resume_id)
@@ -120,7 +128,11 @@ def batch_score():
                     continue
 
                 start_time = time.time()
-                scoring_data = scorer.score_resume_job_fit(resume, job)
+                canonical_id = resume.duplicate_of or resume.id
+                scoring_data = scored.get(canonical_id)
+                if scoring_data is None:
+                    scoring_data = scorer.score_resume_job_fit(resume, job)
+                    scored[canonical_id] = scoring_data
                 processing_time = time.time() - start_time
 
                 # Create scoring result
@@ -131,6 +143,7 @@ def batch_score():
                     skills_score=scoring_data['skills_score'],
                     experience_score=scoring_data['experience_score'],
                     education_score=scoring_data['education_score'],
+                    keywords_score=scoring_data.get('keywords_score', 0.0),
                     ai_model_used=scoring_data.get('model', 'unknown'),
                     processing_time=processing_time,
                     confidence=scoring_data.get('confidence', 0.0),
@@ -167,6 +180,64 @@ def batch_score():
     except Exception as e:
         return jsonify({'error': f'Batch scoring failed: {str(e)}'}), 500
 
+@scoring_bp.route('/rule-score', methods=['POST'])
+def rule_score():
+    '''Score resumes against a stored job with the rule-based scorer, keeping all partial scores'''
+    try:
+        data = request.get_json()
+        job_id = data.get('job_id')
+        resume_ids = data.get('resume_ids', [])
+
+        if not job_id or not resume_ids:
+            return jsonify({'error': 'job_id and resume_ids are required'}), 400
+
+        job = Job.query.get_or_404(job_id)
+        resumes = Resume.query.filter(Resume.id.in_(resume_ids)).all()
+        batch_id = str(uuid.uuid4())
+
+        results = score_and_store(job, resumes, batch_id=batch_id)
+        results = sorted((result.to_dict() for result in results), key=lambda x: x['overall_score'], reverse=True)
+
+        return jsonify({
+            'batch_id': batch_id,
+            'job_id': job.id,
+            'total_processed': len(results),
+            'results': results
+        }), 201
+
+    except Exception as e:
+        return jsonify({'error': f'Rule-based scoring failed: {str(e)}'}), 500
+
+@scoring_bp.route('/rerank', methods=['POST'])
+def rerank_results():
+    '''Re-rank a job's stored results with new component weights (no re-extraction)'''
+    try:
+        data = request.get_json()
+        job_id = data.get('job_id')
+        weights = data.get('weights') or {}
+        limit = data.get('limit')
+
+        if not job_id:
+            return jsonify({'error': 'job_id is required'}), 400
+        if not isinstance(weights, dict):
+            return jsonify({'error': 'weights must be an object'}), 400
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int) or limit <= 0):
+            return jsonify({'error': 'limit must be a positive integer'}), 400
+
+        try:
+            ranking = rerank_job(job_id, weights, limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify({
+            'job_id': job_id,
+            'total': len(ranking),
+            'results': ranking
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Re-ranking failed: {str(e)}'}), 500
+
 @scoring_bp.route('/result/<int:result_id>', methods=['GET'])
 def get_scoring_result(result_id):
     '''Get detailed scoring result'''
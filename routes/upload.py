@@ -5,6 +5,10 @@ from werkzeug.utils import secure_filename
 from models.resume import Resume
 from extensions import db
 from services.document_processor import process_document
+from services.resume_index import index_resume, copy_index_entry
+from services.duplicate_index import compute_signature, find_duplicate, register
+from services.text_search import add_resume, copy_resume
+from document_cache import EXTRACTION_CACHE
 
 upload_bp = Blueprint('upload_bp', __name__)
 
@@ -24,6 +28,16 @@ def upload_resume():
 
     # Process the document
     extracted_data = process_document(file_path)
+    extraction = {'format': extracted_data.get('format'), 'pages': extracted_data.get('pages') or []}
+    # Pages whose OCR failed, was over budget or is unavailable
+    missing = {page['page']: page['source'] for page in extraction['pages']
+               if page['source'] in ('failed', 'skipped', 'none')}
+    if missing:
+        print(f"[WARN] {filename} ({extraction['format']}): pages without OCR text {missing}")
+
+    # Near-duplicate of a stored resume? (MinHash / LSH)
+    signature, signature_bytes = compute_signature(extracted_data.get('processed_text'))
+    duplicate_of = find_duplicate(signature)
 
     # Store in database
     new_resume = Resume(
@@ -41,13 +55,34 @@ def upload_resume():
         certifications=json.dumps(extracted_data.get('certifications')),
         keywords=json.dumps(extracted_data.get('keywords')),
         ocr_confidence=extracted_data.get('ocr_confidence'),
+        extraction=json.dumps(extraction),
+        minhash=signature_bytes,
+        duplicate_of=duplicate_of,
         processing_status='processed'
     )
 
     db.session.add(new_resume)
     db.session.commit()
+    register(new_resume, signature)
+
+    # Keep the skill and similarity indexes in step with stored resumes;
+    # duplicates reuse the original's indexed features and term counts.
+    if duplicate_of is not None:
+        copy_index_entry(new_resume, duplicate_of)
+        copy_resume(new_resume, duplicate_of)
+    else:
+        features = index_resume(new_resume)
+        add_resume(new_resume, features.get("tokens"))
 
     return jsonify({
         'message': 'Resume uploaded and processed successfully!',
         'data': new_resume.to_dict()
     })
+
+
+@upload_bp.route('/cache-stats', methods=['GET'])
+def extraction_cache_stats():
+    # Hit rate of the content-addressed extraction cache (this process)
+    if EXTRACTION_CACHE is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **EXTRACTION_CACHE.stats()})
@@ -1,9 +1,11 @@
-from document_pytesseract import extract_text
+from document_pytesseract import extract_document
 
 class DocumentProcessor:
     def process_resume(self, file_path):
-        # Extract text from file
-        text = extract_text(file_path)
+        # Extract text from file: type sniffed from its content; PDFs from
+        # the text layer first, OCR only where needed
+        extraction = extract_document(file_path)
+        text = extraction["text"]
 
         # Extract basic info (placeholder for now)
         candidate_name = ""
@@ -28,7 +30,9 @@ class DocumentProcessor:
             "experience": [],
             "education": [],
             "certifications": [],
-            "keywords": []
+            "keywords": [],
+            "format": extraction["format"],
+            "pages": extraction["pages"]
         }
 
 # ✅ Wrapper function for easy use in routes
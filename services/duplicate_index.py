@@ -0,0 +1,70 @@
+# services/duplicate_index.py
+import os
+import threading
+
+from models.resume import Resume
+from nlp.minhash import LSHIndex, minhash_signature, signature_from_bytes, signature_to_bytes
+
+# Estimated Jaccard similarity (word 3-gram shingles) from which a new
+# upload is treated as a copy of a stored resume
+DUPLICATE_THRESHOLD = float(os.getenv('DUPLICATE_THRESHOLD', 0.9))
+
+_lsh = LSHIndex()
+_last_resume_id = 0
+_lock = threading.Lock()
+
+
+def _sync():
+    '''
+    Load signatures of resumes stored since the last sync (by this or
+    another worker).
+    '''
+    global _last_resume_id
+
+    resumes = (Resume.query
+               .filter(Resume.id > _last_resume_id)
+               .order_by(Resume.id)
+               .all())
+    for resume in resumes:
+        if resume.minhash:
+            _lsh.add(resume.id, signature_from_bytes(resume.minhash))
+        _last_resume_id = max(_last_resume_id, resume.id)
+
+
+def compute_signature(processed_text):
+    '''
+    (signature, bytes for Resume.minhash); both None for empty text.
+    '''
+    signature = minhash_signature(processed_text or '')
+    if signature is None:
+        return None, None
+    return signature, signature_to_bytes(signature)
+
+
+def find_duplicate(signature):
+    '''
+    ID of the original stored resume this signature nearly duplicates,
+    or None. Duplicates of duplicates resolve to the first upload.
+    '''
+    if signature is None:
+        return None
+    with _lock:
+        _sync()
+        matches = _lsh.query(signature, DUPLICATE_THRESHOLD)
+    if not matches:
+        return None
+
+    resume = Resume.query.get(matches[0][0])
+    if resume is None:
+        return None
+    return resume.duplicate_of or resume.id
+
+
+def register(resume, signature):
+    '''
+    Add a committed Resume's signature to the LSH index.
+    '''
+    if signature is None:
+        return
+    with _lock:
+        _lsh.add(resume.id, signature)
@@ -1,16 +1,121 @@
 # services/matcher.py
+from collections import Counter
 from difflib import SequenceMatcher
+import math
+import os
 import re
+import zlib
+
+# Similarity used by calculate_match_score when no mode is given:
+#   sequence    - difflib ratio over characters (quadratic, the original)
+#   jaccard     - |R & J| / |R | J| over word shingles
+#   containment - |R & J| / |J|: share of the job's shingles in the resume
+#   cosine      - cosine of hashed shingle counts
+MATCH_MODE = os.getenv('MATCH_MODE', 'sequence')
+
+# Shingle modes cut cleaned inputs to this many characters before
+# comparing (0 = no limit). "sequence" always compares the full texts,
+# so its score is unchanged.
+MATCH_MAX_CHARS = int(os.getenv('MATCH_MAX_CHARS', 20000))
+
+# Words per shingle and number of hash buckets for the shingle modes
+SHINGLE_SIZE = int(os.getenv('MATCH_SHINGLE_SIZE', 2))
+SHINGLE_BUCKETS = 1 << 20
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9\s]')
+
 
 def preprocess(text):
     """Clean and normalize text for better comparison."""
     text = text.lower()
-    text = re.sub(r'[^a-z0-9\s]', '', text)
+    text = _NON_ALNUM_RE.sub('', text)
     return text
 
-def calculate_match_score(resume_text, job_text):
-    """Calculate how well the resume matches the job description."""
+
+def _truncate(text, max_chars):
+    if max_chars is None:
+        max_chars = MATCH_MAX_CHARS
+    return text[:max_chars] if max_chars else text
+
+
+# ---------- Shingles ----------
+
+def shingles(text, size=None):
+    """
+    Hashed word n-grams of a cleaned text, in order (with repeats).
+    Texts shorter than size words give one shingle of all their words.
+    """
+    size = size or SHINGLE_SIZE
+    words = text.split()
+    if not words:
+        return []
+    if len(words) < size:
+        size = len(words)
+    return [
+        zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) & (SHINGLE_BUCKETS - 1)
+        for i in range(len(words) - size + 1)
+    ]
+
+
+def jaccard_similarity(resume_shingles, job_shingles):
+    resume_set, job_set = set(resume_shingles), set(job_shingles)
+    union = resume_set | job_set
+    return len(resume_set & job_set) / len(union) if union else 0.0
+
+
+def containment_similarity(resume_shingles, job_shingles):
+    job_set = set(job_shingles)
+    return len(set(resume_shingles) & job_set) / len(job_set) if job_set else 0.0
+
+
+def cosine_similarity(resume_shingles, job_shingles):
+    resume_counts, job_counts = Counter(resume_shingles), Counter(job_shingles)
+    if len(resume_counts) > len(job_counts):
+        resume_counts, job_counts = job_counts, resume_counts
+    dot = sum(count * job_counts.get(h, 0) for h, count in resume_counts.items())
+    norm = math.sqrt(sum(c * c for c in resume_counts.values()) * sum(c * c for c in job_counts.values()))
+    return dot / norm if norm else 0.0
+
+
+def sequence_similarity(resume_clean, job_clean):
+    return SequenceMatcher(None, resume_clean, job_clean).ratio()
+
+
+SHINGLE_MODES = {
+    'jaccard': jaccard_similarity,
+    'containment': containment_similarity,
+    'cosine': cosine_similarity,
+}
+
+MATCH_MODES = ('sequence',) + tuple(SHINGLE_MODES)
+
+
+# ---------- Main API ----------
+
+def calculate_match_score(resume_text, job_text, mode=None, max_chars=None):
+    """
+    Calculate how well the resume matches the job description (0-100).
+
+    mode: one of MATCH_MODES (default MATCH_MODE). "sequence" is the
+    original character ratio (quadratic in the worst case). The shingle
+    modes are linear in the input size but measure shared phrasing, not
+    character alignment: their scores correlate with "sequence" at only
+    about 0.3 (Pearson, benchmarks/bench_matcher.py), so they are not
+    drop-in replacements.
+    max_chars overrides MATCH_MAX_CHARS for the shingle modes (0 = no
+    limit).
+    """
+    mode = mode or MATCH_MODE
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Unknown match mode: {mode!r} (expected one of {', '.join(MATCH_MODES)})")
+
     resume_clean = preprocess(resume_text)
     job_clean = preprocess(job_text)
-    ratio = SequenceMatcher(None, resume_clean, job_clean).ratio()
+
+    if mode == 'sequence':
+        ratio = sequence_similarity(resume_clean, job_clean)
+    else:
+        resume_clean = _truncate(resume_clean, max_chars)
+        job_clean = _truncate(job_clean, max_chars)
+        ratio = SHINGLE_MODES[mode](shingles(resume_clean), shingles(job_clean))
     return round(ratio * 100, 2)
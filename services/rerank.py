@@ -0,0 +1,115 @@
+# services/rerank.py
+import time
+
+import numpy as np
+from sqlalchemy import func
+
+from extensions import db
+from models.scoring import ScoringResult
+from nlp.batch_scoring import COMPONENTS, rerank
+from nlp.scoring import DEFAULT_WEIGHTS, compile_job, evaluate_resume_against_compiled_job
+
+# ai_model_used of rows written by score_and_store; other scorers store
+# no keywords_score and scores on a different scale
+RULE_BASED_MODEL = 'rule-based'
+
+
+def normalize_weights(weights, components=COMPONENTS):
+    '''
+    DEFAULT_WEIGHTS overridden by the given ones; raises ValueError for
+    components not in components or negative / non-numeric weights.
+    '''
+    merged = dict(DEFAULT_WEIGHTS)
+    for name, value in (weights or {}).items():
+        if name not in components:
+            raise ValueError(f"Unknown weight '{name}' (expected one of {', '.join(components)})")
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"Weight '{name}' must be a non-negative number")
+        merged[name] = float(value)
+    return merged
+
+
+def score_and_store(job, resumes, batch_id=None):
+    '''
+    Score resumes against a stored Job with the rule-based scorer and
+    persist every partial score, so later weight changes only need
+    rerank_job(). Returns the new ScoringResult rows.
+    '''
+    compiled = compile_job(job.description)
+    results = []
+
+    for resume in resumes:
+        start_time = time.time()
+        # Only the persisted components: no feature dicts, no extraction
+        # stages they do not read
+        evaluation = evaluate_resume_against_compiled_job(resume.raw_text or '', compiled, outputs=COMPONENTS)
+        result = ScoringResult(
+            resume_id=resume.id,
+            job_id=job.id,
+            overall_score=evaluation['job_fit_score'],
+            skills_score=evaluation['skills']['match_percent'],
+            experience_score=evaluation['experience']['score'],
+            education_score=evaluation['education']['score'],
+            keywords_score=evaluation['keywords']['match_percent'],
+            ai_model_used=RULE_BASED_MODEL,
+            processing_time=time.time() - start_time,
+            batch_id=batch_id
+        )
+        result.set_skill_matches(evaluation['skills'])
+        result.set_experience_analysis(evaluation['experience'])
+        result.set_education_analysis(evaluation['education'])
+        db.session.add(result)
+        results.append(result)
+
+    db.session.commit()
+    return results
+
+
+def load_components(job_id):
+    '''
+    (result_ids, resume_ids, components) of the latest rule-based result
+    per resume for a job; components is an (n, 4) array in COMPONENTS
+    order.
+    '''
+    latest = (db.session.query(func.max(ScoringResult.id))
+              .filter(ScoringResult.job_id == job_id,
+                      ScoringResult.ai_model_used == RULE_BASED_MODEL)
+              .group_by(ScoringResult.resume_id))
+    rows = (db.session.query(
+                ScoringResult.id,
+                ScoringResult.resume_id,
+                ScoringResult.skills_score,
+                ScoringResult.experience_score,
+                ScoringResult.education_score,
+                ScoringResult.keywords_score)
+            .filter(ScoringResult.id.in_(latest))
+            .order_by(ScoringResult.id)
+            .all())
+
+    result_ids = [row[0] for row in rows]
+    resume_ids = [row[1] for row in rows]
+    components = np.array([[value or 0.0 for value in row[2:]] for row in rows], dtype=np.float64)
+    return result_ids, resume_ids, components.reshape(-1, len(COMPONENTS))
+
+
+def rerank_job(job_id, weights=None, limit=None):
+    '''
+    Ranking of a job's stored results under new weights, computed in
+    one vectorized pass over the persisted partial scores.
+    '''
+    weights = normalize_weights(weights)
+    result_ids, resume_ids, components = load_components(job_id)
+    ranking = rerank(list(range(len(result_ids))), components, weights)
+    if limit:
+        ranking = ranking[:limit]
+
+    return [
+        {
+            'rank': rank,
+            'result_id': result_ids[row],
+            'resume_id': resume_ids[row],
+            'overall_score': score,
+            **{f'{name}_score': float(components[row, col]) for col, name in enumerate(COMPONENTS)},
+        }
+        for rank, (row, score) in enumerate(ranking, 1)
+    ]
@@ -0,0 +1,169 @@
+# services/resume_index.py
+import threading
+from collections import defaultdict
+
+from extensions import db
+from models.resume import Resume
+from models.skill_index import ResumeTerm
+from nlp.feature_extractor import extract_resume_features
+from nlp.skill_index import SkillIndex, INDEXED_FIELDS
+
+_index = SkillIndex()
+_last_row_id = None     # highest ResumeTerm id applied; None until warmed
+_lock = threading.Lock()
+
+
+def _features_to_rows(resume_id, features):
+    rows = []
+    for field in INDEXED_FIELDS:
+        for term in features.get(field) or []:
+            rows.append(ResumeTerm(resume_id=resume_id, field=field, term=term))
+    # Always written (empty term = unknown), so every indexing leaves at
+    # least one new row for the other workers' _sync to pick up
+    years = features.get("experience_years")
+    rows.append(ResumeTerm(resume_id=resume_id, field="experience_years",
+                           term="" if years is None else str(years)))
+    return rows
+
+
+def _empty_features():
+    features = {field: [] for field in INDEXED_FIELDS}
+    features["experience_years"] = None
+    return features
+
+
+def _add_term(features, field, term):
+    if field == "experience_years":
+        features["experience_years"] = int(term) if term else None
+    elif field in features:
+        features[field].append(term)
+
+
+def _load_features(resume_id):
+    features = _empty_features()
+    for row in ResumeTerm.query.filter_by(resume_id=resume_id).all():
+        _add_term(features, row.field, row.term)
+    return features
+
+
+def _warm():
+    '''
+    Load every stored resume into the index with one query (resumes
+    without index rows get empty features).
+    '''
+    global _last_row_id
+
+    rows = (db.session.query(Resume.id, ResumeTerm.id, ResumeTerm.field, ResumeTerm.term)
+            .outerjoin(ResumeTerm, ResumeTerm.resume_id == Resume.id)
+            .order_by(Resume.id)
+            .all())
+
+    docs = defaultdict(_empty_features)
+    last_row_id = 0
+    for resume_id, row_id, field, term in rows:
+        features = docs[resume_id]
+        if row_id is not None:
+            _add_term(features, field, term)
+            last_row_id = max(last_row_id, row_id)
+
+    for resume_id, features in docs.items():
+        _index.add(resume_id, features)
+    _last_row_id = last_row_id
+
+
+def _sync():
+    '''
+    Bring the in-memory index in step with resumes indexed by other
+    workers: apply the index rows written since the last sync. A
+    resume's rows are replaced in one commit, so its new rows are its
+    complete entry. Deletions are applied by remove_resume() here and
+    by top_k_resumes() for the other workers.
+    '''
+    global _last_row_id
+
+    if _last_row_id is None:
+        _warm()
+        return
+
+    rows = (db.session.query(ResumeTerm.id, ResumeTerm.resume_id, ResumeTerm.field, ResumeTerm.term)
+            .filter(ResumeTerm.id > _last_row_id)
+            .order_by(ResumeTerm.id)
+            .all())
+
+    changed = defaultdict(_empty_features)
+    for row_id, resume_id, field, term in rows:
+        _add_term(changed[resume_id], field, term)
+        _last_row_id = max(_last_row_id, row_id)
+
+    for resume_id, features in changed.items():
+        _index.add(resume_id, features)
+
+
+def index_resume(resume, features=None):
+    '''
+    Extract features for a stored Resume and add it to the index
+    (replacing its previous entry). Call after the Resume row has been
+    committed (it needs an id).
+    '''
+    if features is None:
+        features = extract_resume_features(resume.raw_text or "")
+
+    ResumeTerm.query.filter_by(resume_id=resume.id).delete()
+    db.session.add_all(_features_to_rows(resume.id, features))
+    db.session.commit()
+
+    with _lock:
+        _sync()
+        # Also covers a re-index that found no terms at all
+        _index.add(resume.id, features)
+    return features
+
+
+def remove_resume(resume_id):
+    '''
+    Drop a resume's index rows and its in-memory entry. Call when the
+    Resume is deleted.
+    '''
+    ResumeTerm.query.filter_by(resume_id=resume_id).delete()
+    db.session.commit()
+    with _lock:
+        _index.remove(resume_id)
+
+
+def copy_index_entry(resume, source_id):
+    '''
+    Index a resume with the stored features of another one (a detected
+    duplicate) instead of extracting them again. Returns those features
+    (indexed fields and experience_years only).
+    '''
+    features = _load_features(source_id)
+    return index_resume(resume, features)
+
+
+def reindex_all():
+    '''
+    Rebuild the index for every stored resume.
+    '''
+    for resume in Resume.query.all():
+        index_resume(resume)
+
+
+def top_k_resumes(job, k=10, weights=None):
+    '''
+    Top-k indexed resumes for a job (JD text or CompiledJob). Resumes
+    deleted by another worker are dropped from the index when they turn
+    up in the results, and the query is repeated without them.
+    '''
+    with _lock:
+        _sync()
+        while True:
+            results = _index.top_k(job, k, weights=weights)
+            ids = [result["resume_id"] for result in results]
+            stored = {resume_id for (resume_id,) in db.session.query(Resume.id).filter(Resume.id.in_(ids))}
+            deleted = [resume_id for resume_id in ids if resume_id not in stored]
+            if not deleted:
+                break
+            for resume_id in deleted:
+                _index.remove(resume_id)
+        stats = dict(_index.last_query_stats)
+    return results, stats
@@ -0,0 +1,107 @@
+# services/semantic_search.py
+import os
+import random
+import threading
+
+from extensions import db
+from models.resume import Resume
+from nlp.embeddings import EMBEDDING_DIMS, EmbeddingIndex, build_embedding_index, resolve_index_dir
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Built offline (see build_index below); resumes uploaded afterwards are
+# only searchable once the index is rebuilt.
+EMBEDDING_INDEX_DIR = os.getenv('EMBEDDING_INDEX_DIR', os.path.join(PROJECT_DIR, 'instance', 'embeddings'))
+
+# The LSA model is fitted on a uniform sample of this many resumes;
+# every resume is still embedded. Rows are streamed from the database
+# in batches of STREAM_BATCH, so neither pass holds the whole pool.
+EMBEDDING_TRAIN_SAMPLE = int(os.getenv('EMBEDDING_TRAIN_SAMPLE', 20000))
+STREAM_BATCH = 1000
+
+_index = None
+_index_version = None
+_lock = threading.Lock()
+
+
+def _load_index():
+    '''
+    The on-disk index, reloaded when a rebuild published a new version;
+    None if it was never built.
+    '''
+    global _index, _index_version
+
+    index_dir = resolve_index_dir(EMBEDDING_INDEX_DIR)
+    try:
+        version = (str(index_dir), os.path.getmtime(index_dir / 'index.json'))
+    except OSError:
+        return None
+
+    with _lock:
+        if _index is None or version != _index_version:
+            _index = EmbeddingIndex.load(index_dir)
+            _index_version = version
+        return _index
+
+
+def _stream_resumes():
+    '''
+    (id, raw_text) of every resume with text, in id order, fetched in
+    batches.
+    '''
+    query = (db.session.query(Resume.id, Resume.raw_text)
+             .filter(Resume.raw_text.isnot(None), Resume.raw_text != '')
+             .order_by(Resume.id)
+             .yield_per(STREAM_BATCH))
+    for resume_id, raw_text in query:
+        yield resume_id, raw_text
+
+
+def _sample_texts(size, seed=0):
+    '''
+    Uniform sample of up to size resume texts (reservoir sampling over
+    one streamed pass).
+    '''
+    rng = random.Random(seed)
+    sample = []
+    for seen, (_, text) in enumerate(_stream_resumes()):
+        if seen < size:
+            sample.append(text)
+        else:
+            slot = rng.randint(0, seen)
+            if slot < size:
+                sample[slot] = text
+    return sample
+
+
+def build_index(directory=None, dims=EMBEDDING_DIMS, train_sample=EMBEDDING_TRAIN_SAMPLE):
+    '''
+    Fit the LSA model on a sample of the stored resumes, then stream
+    every resume through it into the vectors and IVF index. Run inside
+    an app context.
+    '''
+    train_texts = _sample_texts(train_sample)
+    if not train_texts:
+        raise ValueError('No resumes with text to index')
+    index = build_embedding_index(_stream_resumes(), directory or EMBEDDING_INDEX_DIR, dims=dims,
+                                  train_texts=train_texts)
+    print(f"Embedded {len(index)} resumes into {directory or EMBEDDING_INDEX_DIR}")
+    return index
+
+
+def nearest_resumes(job_text, k=10):
+    '''
+    The k resumes closest to a job description in LSA space, best first,
+    or None when no index has been built.
+    '''
+    index = _load_index()
+    if index is None:
+        return None
+    return [{'resume_id': resume_id, 'similarity': score} for resume_id, score in index.search(job_text, k)]
+
+
+if __name__ == '__main__':
+    from app import create_app
+
+    with create_app().app_context():
+        build_index()
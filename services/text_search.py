@@ -0,0 +1,103 @@
+# services/text_search.py
+import threading
+
+from extensions import db
+from models.resume import Resume
+from nlp.feature_extractor import extract_resume_features, extract_jd_features
+from nlp.text_index import SparseTextIndex
+
+_index = SparseTextIndex()
+_last_resume_id = 0
+_lock = threading.Lock()
+
+
+def _sync():
+    '''
+    Add resumes stored since the last sync (by this or another worker).
+    The first call loads the whole pool. Only id and raw_text are read.
+    Deleted resumes are dropped by remove_resume(), or by search_resumes()
+    when another worker deleted them.
+    '''
+    global _last_resume_id
+
+    rows = (db.session.query(Resume.id, Resume.raw_text)
+            .filter(Resume.id > _last_resume_id)
+            .order_by(Resume.id)
+            .all())
+    for resume_id, raw_text in rows:
+        if resume_id not in _index:
+            tokens = extract_resume_features(raw_text or "", fields=["tokens"])["tokens"]
+            _index.add(resume_id, tokens)
+        _last_resume_id = max(_last_resume_id, resume_id)
+
+
+def _drop_deleted(resume_ids):
+    '''
+    Remove the given ids that no longer exist in the database (deleted
+    by another worker). Returns True if any were removed.
+    '''
+    stored = {resume_id for (resume_id,) in db.session.query(Resume.id).filter(Resume.id.in_(resume_ids))}
+    deleted = [resume_id for resume_id in resume_ids if resume_id not in stored]
+    for resume_id in deleted:
+        _index.remove(resume_id)
+    return bool(deleted)
+
+
+def add_resume(resume, tokens=None):
+    '''
+    Add a committed Resume to the similarity index (IDF statistics are
+    updated incrementally). Pass tokens when features were already
+    extracted, e.g. the dict returned by index_resume().
+    '''
+    if tokens is None:
+        tokens = extract_resume_features(resume.raw_text or "", fields=["tokens"])["tokens"]
+    with _lock:
+        _index.add(resume.id, tokens)
+
+
+def copy_resume(resume, source_id):
+    '''
+    Add a committed Resume with the indexed term counts of another one
+    (a detected duplicate) instead of extracting its tokens. Extracts
+    only when the source is not indexed.
+    '''
+    with _lock:
+        if _index.copy(resume.id, source_id):
+            return
+        # Source not loaded yet: the sync indexes the pool up to here
+        _sync()
+        if resume.id in _index:
+            return
+    add_resume(resume)
+
+
+def remove_resume(resume_id):
+    '''
+    Drop a deleted resume from the similarity index (and its IDF
+    statistics).
+    '''
+    with _lock:
+        _index.remove(resume_id)
+
+
+def get_text_index():
+    '''
+    The up-to-date index, e.g. for evaluate_resume_against_jd(text_index=...).
+    '''
+    with _lock:
+        _sync()
+    return _index
+
+
+def search_resumes(job_text, k=10):
+    '''
+    Retrieval stage: the k stored resumes most similar to a job
+    description (BM25, 0-100), best first.
+    '''
+    jd_tokens = extract_jd_features(job_text, fields=["tokens"])["tokens"]
+    with _lock:
+        _sync()
+        hits = _index.top_k(jd_tokens, k)
+        while hits and _drop_deleted([resume_id for resume_id, _ in hits]):
+            hits = _index.top_k(jd_tokens, k)
+    return [{'resume_id': resume_id, 'similarity': score} for resume_id, score in hits]